@@ -0,0 +1,168 @@
+from typing import Callable, Dict, List, Sequence
+
+import torch
+
+import config
+
+FAKE_CLASS = 0  # column of the fake probability in the model's softmax output
+
+VOTE = "vote"
+MEAN_LOG_ODDS = "mean_log_odds"
+TRIMMED_MEAN = "trimmed_mean"
+TOP_K = "top_k"
+EMA = "ema"
+
+EPSILON = 1e-6
+
+
+def log_odds(fake_probabilities: torch.Tensor) -> torch.Tensor:
+    p = fake_probabilities.clamp(EPSILON, 1 - EPSILON)
+    return torch.log(p) - torch.log1p(-p)
+
+
+def vote_score(fake_probabilities: torch.Tensor) -> torch.Tensor:
+    """Share of frames whose argmax label is FAKE (the original majority vote)"""
+    return (fake_probabilities > 0.5).float().mean()
+
+
+def mean_log_odds_score(fake_probabilities: torch.Tensor) -> torch.Tensor:
+    """Average the per-frame log-odds and map back to a probability
+
+    Confident frames count for more than borderline ones, unlike a vote on
+    hard labels.
+    """
+    return torch.sigmoid(log_odds(fake_probabilities).mean())
+
+
+def trimmed_mean_score(fake_probabilities: torch.Tensor, trim: float = None) -> torch.Tensor:
+    """Mean fake probability after dropping the `trim` fraction of frames at each end"""
+    if trim is None:
+        trim = config.AGGREGATION_TRIM
+    count = fake_probabilities.numel()
+    cut = min(int(count * trim), (count - 1) // 2)
+    ordered, _ = torch.sort(fake_probabilities)
+    return ordered[cut:count - cut].mean()
+
+
+def top_k_score(fake_probabilities: torch.Tensor, k: int = None) -> torch.Tensor:
+    """Mean fake probability of the k most suspicious frames
+
+    Catches manipulation confined to a short segment of a long video, which
+    averages over all frames dilute.
+    """
+    if k is None:
+        k = config.AGGREGATION_TOP_K
+    k = max(1, min(k, fake_probabilities.numel()))
+    return torch.topk(fake_probabilities, k).values.mean()
+
+
+def ema_curve(fake_probabilities: torch.Tensor, alpha: float = None) -> torch.Tensor:
+    """Exponentially smoothed fake probability over time, s_t = alpha * p_t + (1 - alpha) * s_{t-1}
+
+    Computed in one matrix product instead of a Python loop; the curve
+    starts at the first frame's probability.
+    """
+    if alpha is None:
+        alpha = config.AGGREGATION_EMA_ALPHA
+    count = fake_probabilities.numel()
+    steps = torch.arange(count, dtype=fake_probabilities.dtype)
+    lags = steps[:, None] - steps[None, :]
+    weights = alpha * (1 - alpha) ** lags.clamp(min=0)
+    weights[:, 0] = (1 - alpha) ** steps  # s_0 = p_0 carries the remaining weight
+    weights = weights.tril()
+    return weights @ fake_probabilities
+
+
+def ema_score(fake_probabilities: torch.Tensor, alpha: float = None) -> torch.Tensor:
+    """Peak of the smoothed curve: sustained suspicious stretches, not single-frame spikes"""
+    return ema_curve(fake_probabilities, alpha).max()
+
+
+AGGREGATORS: Dict[str, Callable[[torch.Tensor], torch.Tensor]] = {
+    VOTE: vote_score,
+    MEAN_LOG_ODDS: mean_log_odds_score,
+    TRIMMED_MEAN: trimmed_mean_score,
+    TOP_K: top_k_score,
+    EMA: ema_score,
+}
+
+
+def timeline(fake_probabilities: torch.Tensor, timestamps: Sequence[float]) -> List[Dict]:
+    """Mean fake probability per second of video, for the seconds that have sampled frames"""
+    seconds = torch.as_tensor(timestamps, dtype=torch.float64).floor().long()
+    weights = fake_probabilities.double()
+    counts = torch.bincount(seconds)
+    sums = torch.bincount(seconds, weights=weights)
+    peaks = torch.zeros(len(counts), dtype=torch.float64).scatter_reduce(
+        0, seconds, weights, reduce="amax", include_self=False
+    )
+    present = torch.nonzero(counts).flatten()
+    return [
+        {
+            "second": second,
+            "fake_probability": round(mean, 4),
+            "max_fake_probability": round(peak, 4),
+            "frames": frames,
+        }
+        for second, mean, peak, frames in zip(
+            present.tolist(),
+            (sums[present] / counts[present]).tolist(),
+            peaks[present].tolist(),
+            counts[present].tolist(),
+        )
+    ]
+
+
+def aggregate(probabilities: torch.Tensor, timestamps: Sequence[float], method: str = None) -> Dict:
+    """Video verdict from the per-frame softmax outputs (frames x classes)
+
+    The chosen aggregator reduces the fake probabilities to one score in
+    [0, 1]; scores within AGGREGATION_UNCERTAIN_MARGIN of 0.5 are
+    UNCERTAIN. The vote keeps its original confidence, the mean of each
+    frame's winning-class confidence; the other methods report the score of
+    the winning side.
+    """
+    method = method or config.VIDEO_AGGREGATION
+    if method not in AGGREGATORS:
+        raise ValueError(f"Unknown aggregation method: {method}")
+
+    fake_probabilities = probabilities[:, FAKE_CLASS].float()
+    num_frames = fake_probabilities.numel()
+    score = AGGREGATORS[method](fake_probabilities).item()
+    margin = config.AGGREGATION_UNCERTAIN_MARGIN
+
+    if method == VOTE:
+        fake_count = int((fake_probabilities > 0.5).sum())
+        real_count = num_frames - fake_count
+        confidence = probabilities.max(dim=1).values.mean().item() * 100
+        if fake_count > real_count:
+            verdict = "FAKE"
+            explanation = f"Analysis of {num_frames} frames detected manipulation in {fake_count} frames. Inconsistencies in facial features and temporal artifacts suggest synthetic content."
+        elif real_count > fake_count:
+            verdict = "REAL"
+            explanation = f"Analysis of {num_frames} frames shows consistent authentic features in {real_count} frames. No significant manipulation artifacts detected."
+        else:
+            verdict = "UNCERTAIN"
+            explanation = f"Analysis inconclusive. Equal distribution of authentic and synthetic indicators across {num_frames} frames."
+    else:
+        label = method.replace("_", " ")
+        if score > 0.5 + margin:
+            verdict = "FAKE"
+            confidence = score * 100
+            explanation = f"Analysis of {num_frames} frames ({label}) gives a {confidence:.0f}% probability of manipulation. Inconsistencies in facial features and temporal artifacts suggest synthetic content."
+        elif score < 0.5 - margin:
+            verdict = "REAL"
+            confidence = (1 - score) * 100
+            explanation = f"Analysis of {num_frames} frames ({label}) gives a {confidence:.0f}% probability of authentic content. No significant manipulation artifacts detected."
+        else:
+            verdict = "UNCERTAIN"
+            confidence = max(score, 1 - score) * 100
+            explanation = f"Analysis inconclusive. The {label} of {num_frames} frames is too close to even to call."
+
+    return {
+        "verdict": verdict,
+        "confidence": round(confidence, 2),
+        "explanation": explanation,
+        "aggregation": {"method": method, "fake_score": round(score, 4)},
+        "timeline": timeline(fake_probabilities, timestamps),
+    }
@@ -1,25 +1,99 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, Response, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
-import aiofiles
+import asyncio
+import functools
+import json
+import threading
+import time
 from pathlib import Path
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional
 
 import config
-from model import get_detector
+from model import get_detector, model_fingerprint
 from gradcam import GradCAMExplainer
 from video_processor import VideoProcessor
+from executor import get_executor, ExecutorBusyError
+from upload_handler import save_upload, read_upload, UploadTooLargeError, UploadLimitMiddleware
+from image_io import decode_image
+from PIL import UnidentifiedImageError
+import torch
+from result_cache import get_result_cache, ResultCache
+from blob_store import get_blob_store
+from results_sweeper import get_results_sweeper
+from explanation_cache import get_explanation_cache
+import metrics
+from jobs import JobStore, JobManager, job_status, COMPLETED, FAILED
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_task = asyncio.create_task(warm_up()) if config.WARMUP_ENABLED else None
+    job_manager.resume()
+    if results_sweeper is not None:
+        results_sweeper.start()
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    if results_sweeper is not None:
+        results_sweeper.close()
+    inference_executor.shutdown()
+    if video_processor is not None:
+        video_processor.close()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="DeepTrust API",
     description="Deepfake Detection API with Explainability",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Upload size limits per endpoint, checked against Content-Length before the
+# body is read, counted while the body streams in (chunked uploads too) and
+# enforced again while the file is written to disk
+UPLOAD_LIMITS = {
+    "/api/analyze/image": config.MAX_IMAGE_UPLOAD_BYTES,
+    "/api/analyze/video": config.MAX_VIDEO_UPLOAD_BYTES,
+    "/api/analyze/video/stream": config.MAX_VIDEO_UPLOAD_BYTES,
+    "/api/jobs/video": config.MAX_VIDEO_UPLOAD_BYTES,
+}
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+app.add_middleware(UploadLimitMiddleware, limits=UPLOAD_LIMITS, overhead_bytes=MULTIPART_OVERHEAD_BYTES)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Per-route latency and status counts; streamed responses are timed until their headers are sent"""
+    if not config.METRICS_ENABLED:
+        return await call_next(request)
+
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template so ids in the path don't explode the series count
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    metrics.REQUEST_SECONDS.observe(time.perf_counter() - start, route=route)
+    metrics.REQUESTS.inc(route=route, status=response.status_code)
+    return response
+
+
+@app.middleware("http")
+async def track_result_access(request: Request, call_next):
+    """Count heatmap downloads as accesses so the sweeper evicts by real use"""
+    response = await call_next(request)
+    if results_sweeper is not None and response.status_code == 200 and request.url.path.startswith("/results/"):
+        results_sweeper.track(config.RESULTS_DIR / request.url.path[len("/results/"):])
+    return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=config.CORS_ORIGINS,
@@ -35,20 +109,286 @@ app.mount("/results", StaticFiles(directory=str(config.RESULTS_DIR)), name="resu
 detector = None
 gradcam_explainer = None
 video_processor = None
+services_lock = threading.Lock()
+inference_executor = get_executor()
+result_cache = get_result_cache()
+blob_store = get_blob_store()
+explanation_cache = get_explanation_cache()
+readiness = {"status": "starting", "error": None}
+
+
+def active_temp_paths():
+    """Temp files still needed by queued or running jobs"""
+    return [job["meta"]["video_path"] for job in job_store.unfinished() if job["meta"].get("video_path")]
+
+
+results_sweeper = get_results_sweeper(active_temp_paths) if config.RESULTS_SWEEPER_ENABLED else None
+
+metrics.QUEUE_DEPTH.set_function(lambda: inference_executor.pending)
+metrics.FACE_DETECTORS.set_function(
+    lambda: video_processor.detector_pool.created if video_processor and video_processor.detector_pool else 0,
+    state="created"
+)
+metrics.FACE_DETECTORS.set_function(
+    lambda: video_processor.detector_pool.in_use if video_processor and video_processor.detector_pool else 0,
+    state="in_use"
+)
+metrics.MODELS_LOADED.set_function(lambda: int(detector is not None and gradcam_explainer is not None))
 
 
 # ✅ LAZY LOAD SERVICES (CRITICAL FIX)
 def get_services():
     global detector, gradcam_explainer, video_processor
 
-    if detector is None:
-        detector = get_detector()
+    with services_lock:
+        if detector is None:
+            detector = get_detector()
+
+        if gradcam_explainer is None:
+            gradcam_explainer = GradCAMExplainer(
+                detector.model,
+                detector.device,
+                lock=detector.model_lock
+            )
+
+        if video_processor is None:
+            video_processor = VideoProcessor()
+
+
+async def run_inference(fn, *args, timeout: float = None, **kwargs):
+    """Run blocking work on the inference executor, mapping overload to HTTP errors"""
+    try:
+        return await inference_executor.run(fn, *args, timeout=timeout, **kwargs)
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(config.RETRY_AFTER_SECONDS)}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Processing timed out")
+
+
+def cached_assets_exist(response: dict) -> bool:
+    """Cached responses are only valid while the heatmap and thumbnails they point to still exist"""
+    heatmap_url = response.get("heatmap_url")
+    if heatmap_url is not None and not (config.RESULTS_DIR / Path(heatmap_url).name).exists():
+        return False
+
+    blob_prefix = blob_store.url("")
+    for frame in response.get("frames", []):
+        thumbnail = frame.get("thumbnail", "")
+        if thumbnail.startswith(blob_prefix) and not blob_store.exists(thumbnail[len(blob_prefix):]):
+            return False
+    return True
+
+
+def track_assets(response: dict):
+    """Tell the results sweeper that a response's heatmap and thumbnails were just written or served"""
+    if results_sweeper is None:
+        return
+
+    heatmap_url = response.get("heatmap_url")
+    if heatmap_url is not None:
+        results_sweeper.track(config.RESULTS_DIR / Path(heatmap_url).name)
+
+    blob_prefix = blob_store.url("")
+    thumbnails = [response.get("thumbnail", "")] + [frame.get("thumbnail", "") for frame in response.get("frames", [])]
+    for thumbnail in thumbnails:
+        if thumbnail.startswith(blob_prefix):
+            path = blob_store.local_path(thumbnail[len(blob_prefix):])
+            if path is not None:
+                results_sweeper.track(path)
+
+
+async def get_cached_response(kind: str, content_sha256: str):
+    """Return (cache key, cached response or None); the key is None when caching is disabled"""
+    if result_cache is None:
+        return None, None
+    cache_key = ResultCache.make_key(kind, content_sha256, await run_inference(model_fingerprint))
+    cached = result_cache.get(cache_key, validate=cached_assets_exist)
+    if cached is not None:
+        track_assets(cached)
+    return cache_key, cached
+
+
+def explain_image_bytes(data: memoryview, heatmap_path: str) -> dict:
+    """Decode an uploaded image once and run the combined predict-and-explain pass"""
+    image = decode_image(data)
+    return gradcam_explainer.predict_and_explain(image, heatmap_path)
+
+
+def predict_image_bytes(data: memoryview, file_id: str) -> dict:
+    """Decode an uploaded image and predict without Grad-CAM, keeping its input for /api/explain"""
+    input_tensor = detector.preprocess_array(decode_image(data))
+    explanation_cache.put(file_id, 0, input_tensor)
+    result = detector.predict(input_tensor)
+    result["heatmap_path"] = None
+    return result
+
+
+def remember_image_input(data: memoryview, file_id: str):
+    """Make a cached image response explainable again (decode and preprocess only)"""
+    explanation_cache.put(file_id, 0, detector.preprocess_array(decode_image(data)))
+
+
+def explanation_url(file_id: str, frame_number: int = None) -> str:
+    if frame_number is None:
+        return f"/api/explain/{file_id}"
+    return f"/api/explain/{file_id}/frame/{frame_number}"
+
+
+def prune_explanation_urls(response: dict) -> dict:
+    """Drop frame explanation links whose inputs have expired
+
+    Lazy video responses outlive the explanation cache (the inputs are only
+    kept for EXPLAIN_CACHE_TTL_SECONDS), so a cached hit would otherwise link
+    to heatmaps that 404.
+    """
+    frames = response.get("frames")
+    if not frames or not any("explanation_url" in frame for frame in frames):
+        return response
+
+    pruned = []
+    for frame in frames:
+        if "explanation_url" in frame and explanation_cache.get(response["file_id"], frame["frameNumber"]) is None:
+            frame = {key: value for key, value in frame.items() if key != "explanation_url"}
+        pruned.append(frame)
+    return {**response, "frames": pruned}
+
+
+def video_verdict_settings(multi_face: bool, early_exit: bool) -> str:
+    """Server settings that change which frames are classified or how they add up to a verdict"""
+    settings = {
+        "frames": config.MAX_FRAMES,
+        # Tracking follows a single face, so multi-face mode never uses it
+        "tracking": config.FACE_TRACKING_ENABLED and not multi_face,
+        "trim": config.AGGREGATION_TRIM,
+        "top_k": config.AGGREGATION_TOP_K,
+        "ema_alpha": config.AGGREGATION_EMA_ALPHA,
+        "uncertain_margin": config.AGGREGATION_UNCERTAIN_MARGIN,
+    }
+    if config.FRAME_SELECTION != "uniform":
+        settings.update(
+            candidates=config.SCENE_SAMPLER_CANDIDATES,
+            cut=config.SCENE_CUT_THRESHOLD,
+            dedup=config.SCENE_DEDUP_THRESHOLD,
+        )
+    if config.FACE_TRACKING_ENABLED and not multi_face:
+        settings.update(
+            track_every=config.FACE_TRACK_DETECT_EVERY,
+            track_min_score=config.FACE_TRACK_MIN_SCORE,
+            track_scene_cut=config.FACE_TRACK_SCENE_CUT_THRESHOLD,
+        )
+    if multi_face:
+        settings.update(min_face=config.MULTI_FACE_MIN_SIZE, max_faces=config.MULTI_FACE_MAX_FACES)
+    if early_exit:
+        settings.update(
+            alpha=config.EARLY_EXIT_ALPHA,
+            beta=config.EARLY_EXIT_BETA,
+            min_frames=config.EARLY_EXIT_MIN_FRAMES,
+            max_log_odds=config.EARLY_EXIT_MAX_FRAME_LOG_ODDS,
+            batch=config.EARLY_EXIT_BATCH_SIZE,
+        )
+    return ",".join(f"{name}={value}" for name, value in sorted(settings.items()))
+
+
+def video_cache_kind(inline_thumbnails: bool, multi_face: bool = False, early_exit: bool = False,
+                     explain: bool = True) -> str:
+    """Each response variant (inline thumbnails, per-face results, early exit, aggregation, frame selection, lazy heatmaps) is cached separately
+
+    The settings that change the verdict are part of the kind too, so
+    changing them does not serve results computed under the old values.
+    """
+    kind = "video:inline" if inline_thumbnails else "video"
+    if multi_face:
+        kind = f"{kind}:faces"
+    if early_exit:
+        kind = f"{kind}:early"
+    if config.VIDEO_AGGREGATION != "vote":
+        kind = f"{kind}:{config.VIDEO_AGGREGATION}"
+    if config.FRAME_SELECTION != "uniform":
+        kind = f"{kind}:{config.FRAME_SELECTION}"
+    kind = f"{kind}:{video_verdict_settings(multi_face, early_exit)}"
+    return kind if explain else f"{kind}:lazy"
+
+
+def resolve_early_exit(early_exit: Optional[bool]) -> bool:
+    return config.EARLY_EXIT_ENABLED if early_exit is None else early_exit
+
+
+def build_video_response(result: dict, file_id: str, explain: bool = True) -> dict:
+    """Response payload for a processed video; without explain, frames link to their on-demand heatmaps"""
+    metrics.VERDICTS.inc(kind="video", verdict=result["verdict"])
+    frames = result["frames"]
+    if not explain:
+        frames = [{**frame, "explanation_url": explanation_url(file_id, frame["frameNumber"])} for frame in frames]
+    return {
+        "success": True,
+        "verdict": result["verdict"],
+        "confidence": result["confidence"],
+        "explanation": result["explanation"],
+        "frames": frames,
+        "total_frames": result["total_frames"],
+        "frames_sampled": result.get("frames_sampled", result["total_frames"]),
+        "frames_evaluated": result.get("frames_evaluated", result["total_frames"]),
+        "aggregation": result["aggregation"],
+        "timeline": result["timeline"],
+        **({"sequential_test": result["sequential_test"]} if "sequential_test" in result else {}),
+        "file_id": file_id
+    }
+
+
+def run_video_job(job: dict, progress_callback) -> dict:
+    """Process a queued video job on the executor and cache its response"""
+    get_services()
+    # Jobs queued before on-demand explanations existed rendered heatmaps eagerly
+    explain = job["meta"].get("explain", True)
+    result = video_processor.process_video(
+        job["meta"]["video_path"],
+        detector.backend,
+        gradcam_explainer if explain else None,
+        progress_callback=progress_callback,
+        inline_thumbnails=job["meta"].get("inline_thumbnails", False),
+        multi_face=job["meta"].get("multi_face", False),
+        early_exit=job["meta"].get("early_exit", False),
+        input_sink=None if explain else functools.partial(explanation_cache.put, job["id"])
+    )
+    if not result["success"]:
+        raise RuntimeError(result.get("error", "Video processing failed"))
+
+    response = build_video_response(result, job["id"], explain)
+    track_assets(response)
+    cache_key = job["meta"].get("cache_key")
+    if cache_key is not None and result_cache is not None:
+        result_cache.put(cache_key, response)
+    return response
+
+
+job_store = JobStore(config.JOBS_DB_PATH)
+job_manager = JobManager(job_store, inference_executor, run_video_job)
+
+
+def warmup_services():
+    """Load models and run warm-up inferences at representative batch sizes"""
+    get_services()
+    detector.warmup(config.WARMUP_BATCH_SIZES)
+
+    # The first backward pass allocates the gradient buffers Grad-CAM needs
+    height, width = config.IMAGE_SIZE[1], config.IMAGE_SIZE[0]
+    gradcam_explainer.explain_tensor(torch.zeros((1, 3, height, width), device=detector.device))
 
-    if gradcam_explainer is None:
-        gradcam_explainer = GradCAMExplainer(detector.model, detector.device)
 
-    if video_processor is None:
-        video_processor = VideoProcessor()
+async def warm_up():
+    readiness["status"] = "warming_up"
+    try:
+        await inference_executor.run(warmup_services, timeout=config.WARMUP_TIMEOUT)
+        readiness["status"] = "ready"
+        print("✅ Models loaded and warmed up")
+    except Exception as e:
+        readiness["status"] = "failed"
+        readiness["error"] = str(e) or type(e).__name__
+        print(f"❌ Warm-up failed: {readiness['error']}")
 
 
 @app.get("/")
@@ -65,33 +405,78 @@ async def health_check():
     return {
         "status": "healthy",
         "model_loaded": detector is not None,
+        "inference_pending": inference_executor.pending,
+        "results": results_sweeper.metrics() if results_sweeper is not None else None,
+        "explanations": explanation_cache.metrics(),
         "timestamp": datetime.now().isoformat()
     }
 
 
-@app.post("/api/analyze/image")
-async def analyze_image(file: UploadFile = File(...)):
-    get_services()  # ✅ ENSURE MODELS LOADED
+@app.get("/ready")
+async def readiness_check():
+    if not config.WARMUP_ENABLED and detector is not None:
+        readiness["status"] = "ready"
+
+    content = {
+        "status": readiness["status"],
+        "model_loaded": detector is not None,
+        "timestamp": datetime.now().isoformat()
+    }
+    if detector is not None:
+        # Reported separately so a backend that fell back to eager is visible
+        content["inference_backend"] = detector.backend.name
+        content["inference_backend_requested"] = config.INFERENCE_BACKEND
+    if readiness["error"]:
+        content["error"] = readiness["error"]
+
+    return JSONResponse(status_code=200 if readiness["status"] == "ready" else 503, content=content)
 
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of stage latencies, counters and gauges"""
+    if not config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.post("/api/analyze/image")
+async def analyze_image(
+    file: UploadFile = File(...),
+    explain: bool = Query(False, description="Render the Grad-CAM heatmap now instead of on demand via /api/explain")
+):
     if not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
 
     file_id = str(uuid.uuid4())
-    file_extension = Path(file.filename).suffix
-    temp_path = config.TEMP_DIR / f"{file_id}{file_extension}"
     heatmap_path = config.RESULTS_DIR / f"{file_id}_heatmap.jpg"
 
     try:
-        async with aiofiles.open(temp_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
-
-        result = detector.predict_from_file(str(temp_path))
-
-        heatmap_result = gradcam_explainer.generate_heatmap(
-            str(temp_path),
-            str(heatmap_path)
-        )
+        upload = await read_upload(file, config.MAX_IMAGE_UPLOAD_BYTES)
+
+        cache_key, cached = await get_cached_response("image" if explain else "image:lazy", upload["sha256"])
+        if cached is not None:
+            if not explain and explanation_cache.get(cached["file_id"], 0) is None:
+                await run_inference(get_services)
+                await run_inference(remember_image_input, upload["data"], cached["file_id"])
+            return JSONResponse(content={**cached, "cached": True})
+
+        await run_inference(get_services)  # ✅ ENSURE MODELS LOADED
+
+        if explain:
+            result = await run_inference(
+                explain_image_bytes,
+                upload["data"],
+                str(heatmap_path),
+                timeout=config.IMAGE_TIMEOUT
+            )
+        else:
+            result = await run_inference(
+                predict_image_bytes,
+                upload["data"],
+                file_id,
+                timeout=config.IMAGE_TIMEOUT
+            )
 
         prediction = result["prediction"]
         confidence = result["confidence"]
@@ -118,73 +503,337 @@ async def analyze_image(file: UploadFile = File(...)):
                 "Manual verification recommended."
             )
 
+        metrics.VERDICTS.inc(kind="image", verdict=verdict)
         response = {
             "success": True,
             "verdict": verdict,
             "confidence": confidence,
             "explanation": explanation,
             "probabilities": result["probabilities"],
-            "heatmap_url": f"/results/{file_id}_heatmap.jpg" if heatmap_result["success"] else None,
+            "heatmap_url": f"/results/{file_id}_heatmap.jpg" if result["heatmap_path"] else None,
             "file_id": file_id
         }
+        if not explain:
+            response["explanation_url"] = explanation_url(file_id)
+        track_assets(response)
+
+        if cache_key is not None:
+            result_cache.put(cache_key, response)
 
-        temp_path.unlink(missing_ok=True)
         return JSONResponse(content=response)
 
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnidentifiedImageError:
+        raise HTTPException(status_code=400, detail="File is not a readable image")
+    except HTTPException:
+        heatmap_path.unlink(missing_ok=True)
+        raise
     except Exception as e:
-        temp_path.unlink(missing_ok=True)
         heatmap_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Error processing image: {str(e)}")
 
 
 @app.post("/api/analyze/video")
-async def analyze_video(file: UploadFile = File(...)):
-    get_services()  # ✅ ENSURE MODELS LOADED
-
+async def analyze_video(
+    file: UploadFile = File(...),
+    inline_thumbnails: bool = Query(False, description="Return thumbnails as base64 data URLs"),
+    multi_face: bool = Query(False, description="Classify every detected face, not just the first"),
+    early_exit: Optional[bool] = Query(None, description="Stop once the verdict is statistically settled (default: EARLY_EXIT_ENABLED)"),
+    explain: bool = Query(False, description="Render Grad-CAM heatmaps as thumbnails now instead of on demand via /api/explain")
+):
     if not file.content_type.startswith("video/"):
         raise HTTPException(status_code=400, detail="File must be a video")
 
+    early_exit = resolve_early_exit(early_exit)
     file_id = str(uuid.uuid4())
     file_extension = Path(file.filename).suffix
     temp_path = config.TEMP_DIR / f"{file_id}{file_extension}"
 
     try:
-        async with aiofiles.open(temp_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        upload = await save_upload(file, temp_path, config.MAX_VIDEO_UPLOAD_BYTES)
+
+        cache_key, cached = await get_cached_response(
+            video_cache_kind(inline_thumbnails, multi_face, early_exit, explain), upload["sha256"]
+        )
+        if cached is not None:
+            return JSONResponse(content={**prune_explanation_urls(cached), "cached": True})
+
+        await run_inference(get_services)  # ✅ ENSURE MODELS LOADED
 
-        result = video_processor.process_video(
+        result = await run_inference(
+            video_processor.process_video,
             str(temp_path),
-            detector.model,
-            gradcam_explainer
+            detector.backend,
+            gradcam_explainer if explain else None,
+            inline_thumbnails=inline_thumbnails,
+            multi_face=multi_face,
+            early_exit=early_exit,
+            input_sink=None if explain else functools.partial(explanation_cache.put, file_id),
+            timeout=config.VIDEO_TIMEOUT
         )
 
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result.get("error", "Video processing failed"))
 
-        response = {
-            "success": True,
-            "verdict": result["verdict"],
-            "confidence": result["confidence"],
-            "explanation": result["explanation"],
-            "frames": result["frames"],
-            "total_frames": result["total_frames"],
-            "file_id": file_id
-        }
+        response = build_video_response(result, file_id, explain)
+        track_assets(response)
+
+        if cache_key is not None:
+            result_cache.put(cache_key, response)
 
-        temp_path.unlink(missing_ok=True)
         return JSONResponse(content=response)
 
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing video: {str(e)}")
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+STREAM_MEDIA_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def format_stream_event(event: dict, stream_format: str) -> str:
+    if stream_format == "ndjson":
+        return json.dumps(event) + "\n"
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def next_stream_event(events) -> dict:
+    """Advance a blocking event iterator on the executor, waiting out a full queue"""
+    deadline = time.monotonic() + config.INFERENCE_TIMEOUT
+    while True:
+        try:
+            return await inference_executor.run(next, events, None)
+        except ExecutorBusyError:
+            if time.monotonic() > deadline:
+                return {"type": "error", "error": "Server is busy"}
+            await asyncio.sleep(0.1)
+        except asyncio.TimeoutError:
+            return {"type": "error", "error": "Processing timed out"}
+        except Exception as e:
+            return {"type": "error", "error": f"Error processing video: {str(e)}"}
+
+
+@app.post("/api/analyze/video/stream")
+async def analyze_video_stream(
+    file: UploadFile = File(...),
+    stream_format: str = Query("sse", alias="format"),
+    inline_thumbnails: bool = Query(False, description="Return thumbnails as base64 data URLs"),
+    multi_face: bool = Query(False, description="Classify every detected face, not just the first"),
+    explain: bool = Query(False, description="Render Grad-CAM heatmaps as thumbnails now instead of on demand via /api/explain")
+):
+    """Stream per-frame results as SSE (default) or NDJSON, then the overall verdict"""
+    if not file.content_type.startswith("video/"):
+        raise HTTPException(status_code=400, detail="File must be a video")
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be 'sse' or 'ndjson'")
+
+    file_id = str(uuid.uuid4())
+    file_extension = Path(file.filename).suffix
+    temp_path = config.TEMP_DIR / f"{file_id}{file_extension}"
+
+    try:
+        await save_upload(file, temp_path, config.MAX_VIDEO_UPLOAD_BYTES)
+        await run_inference(get_services)  # ✅ ENSURE MODELS LOADED
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        temp_path.unlink(missing_ok=True)
+        raise
     except Exception as e:
         temp_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Error processing video: {str(e)}")
 
+    events = video_processor.iter_video(
+        str(temp_path),
+        detector.backend,
+        gradcam_explainer if explain else None,
+        inline_thumbnails=inline_thumbnails,
+        multi_face=multi_face,
+        input_sink=None if explain else functools.partial(explanation_cache.put, file_id)
+    )
+
+    async def stream():
+        try:
+            while True:
+                event = await next_stream_event(events)
+                if event is None:
+                    break
+                if event["type"] == "frame":
+                    track_assets(event)
+                    if not explain:
+                        event["explanation_url"] = explanation_url(file_id, event["frameNumber"])
+                if event["type"] == "result":
+                    event["file_id"] = file_id
+                    metrics.VERDICTS.inc(kind="video", verdict=event["verdict"])
+                yield format_stream_event(event, stream_format)
+                if event["type"] in ("result", "error"):
+                    break
+        finally:
+            try:
+                events.close()
+            except ValueError:
+                # Still running on a worker thread; it is released when collected
+                pass
+            temp_path.unlink(missing_ok=True)
+
+    return StreamingResponse(
+        stream(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/jobs/video", status_code=202)
+async def create_video_job(
+    file: UploadFile = File(...),
+    inline_thumbnails: bool = Query(False, description="Return thumbnails as base64 data URLs"),
+    multi_face: bool = Query(False, description="Classify every detected face, not just the first"),
+    early_exit: Optional[bool] = Query(None, description="Stop once the verdict is statistically settled (default: EARLY_EXIT_ENABLED)"),
+    explain: bool = Query(False, description="Render Grad-CAM heatmaps as thumbnails now instead of on demand via /api/explain")
+):
+    if not file.content_type.startswith("video/"):
+        raise HTTPException(status_code=400, detail="File must be a video")
+
+    early_exit = resolve_early_exit(early_exit)
+    job_id = str(uuid.uuid4())
+    file_extension = Path(file.filename).suffix
+    temp_path = config.TEMP_DIR / f"{job_id}{file_extension}"
+
+    try:
+        upload = await save_upload(file, temp_path, config.MAX_VIDEO_UPLOAD_BYTES)
+        cache_key, cached = await get_cached_response(
+            video_cache_kind(inline_thumbnails, multi_face, early_exit, explain), upload["sha256"]
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    if cached is not None:
+        temp_path.unlink(missing_ok=True)
+        job = job_store.create(job_id, "video")
+        job = job_store.update(job_id, status=COMPLETED, result={**prune_explanation_urls(cached), "cached": True})
+        return JSONResponse(status_code=202, content=job_status(job))
+
+    job = job_store.create(job_id, "video", meta={
+        "video_path": str(temp_path),
+        "cache_key": cache_key,
+        "inline_thumbnails": inline_thumbnails,
+        "multi_face": multi_face,
+        "early_exit": early_exit,
+        "explain": explain
+    })
+    try:
+        job_manager.submit(job)
+    except ExecutorBusyError:
+        temp_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(config.RETRY_AFTER_SECONDS)}
+        )
+
+    return JSONResponse(status_code=202, content=job_status(job))
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=f"Error processing video: {job['error']}")
+    if job["status"] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return JSONResponse(content=job["result"])
+
+
+@app.get("/api/blobs/{key}")
+async def get_blob(key: str, request: Request):
+    """Serve a content-addressed asset with a strong ETag; blobs never change once written"""
+    if not blob_store.is_valid_key(key):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "public, max-age=31536000, immutable"
+    }
+    if results_sweeper is not None and blob_store.local_path(key) is not None:
+        results_sweeper.track(blob_store.local_path(key))
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")] and blob_store.exists(key):
+        return Response(status_code=304, headers=headers)
+
+    data = blob_store.get(key)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return Response(content=data, media_type="image/jpeg", headers=headers)
+
+
+async def render_explanation(file_id: str, frame: int) -> Response:
+    """Serve a memoized Grad-CAM overlay, rendering it from the cached input on first request"""
+    overlay = explanation_cache.get_overlay(file_id, frame)
+    if overlay is None:
+        input_tensor = explanation_cache.get(file_id, frame)
+        if input_tensor is None:
+            raise HTTPException(
+                status_code=404,
+                detail="No explanation available; inputs are only kept for a short time after analysis"
+            )
+        await run_inference(get_services)
+        overlay = await run_inference(
+            gradcam_explainer.render_explanation,
+            input_tensor,
+            timeout=config.IMAGE_TIMEOUT
+        )
+        explanation_cache.put_overlay(file_id, frame, overlay)
+
+    return Response(
+        content=overlay,
+        media_type="image/jpeg",
+        headers={"Cache-Control": f"private, max-age={int(config.EXPLAIN_CACHE_TTL_SECONDS)}"}
+    )
+
+
+@app.get("/api/explain/{file_id}")
+async def explain_image(file_id: str):
+    """Grad-CAM overlay of an analyzed image"""
+    return await render_explanation(file_id, 0)
+
+
+@app.get("/api/explain/{file_id}/frame/{frame_number}")
+async def explain_frame(file_id: str, frame_number: int):
+    """Grad-CAM overlay of an analyzed video frame (frameNumber from the response)"""
+    return await render_explanation(file_id, frame_number)
+
 
 @app.delete("/api/cleanup/{file_id}")
 async def cleanup_files(file_id: str):
     try:
         heatmap_path = config.RESULTS_DIR / f"{file_id}_heatmap.jpg"
         heatmap_path.unlink(missing_ok=True)
+        if results_sweeper is not None:
+            results_sweeper.forget(heatmap_path)
+        explanation_cache.discard(file_id)
         return {"success": True, "message": "Files cleaned up"}
     except Exception as e:
         return {"success": False, "error": str(e)}
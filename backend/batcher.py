@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+
+import torch
+
+import config
+
+
+class MicroBatcher:
+    """Coalesce concurrent forward passes into batched ones
+
+    Callers submit preprocessed tensors from any thread. A single worker
+    thread collects up to max_batch_size items, or whatever arrived within
+    max_wait_ms of the first one, runs one batched forward pass and hands
+    each caller its own slice of the softmax output. The model is in eval
+    mode, so every row is computed independently of its batch neighbours.
+    """
+
+    def __init__(self, model, device, max_batch_size: int = None,
+                 max_wait_ms: float = None, lock: threading.Lock = None):
+        self.model = model
+        self.device = device
+        self.max_batch_size = max_batch_size or config.BATCH_MAX_SIZE
+        if max_wait_ms is None:
+            max_wait_ms = config.BATCH_MAX_WAIT_MS
+        self.max_wait = max_wait_ms / 1000
+        self.lock = lock
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, image_tensor: torch.Tensor) -> Future:
+        """Queue a [C, H, W] or [N, C, H, W] tensor; resolves to its [N, classes] probabilities"""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        if image_tensor.dim() == 3:
+            image_tensor = image_tensor.unsqueeze(0)
+        future = Future()
+        self._queue.put((image_tensor, future))
+        return future
+
+    def predict(self, image_tensor: torch.Tensor) -> torch.Tensor:
+        """Blocking variant of submit"""
+        return self.submit(image_tensor).result()
+
+    def close(self):
+        """Finish queued work and stop the worker thread"""
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self) -> list:
+        """Block for the first item, then gather more until the batch is full or the wait expires"""
+        item = self._queue.get()
+        if item is None:
+            return []
+
+        batch = [item]
+        size = item[0].shape[0]
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the sentinel back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+            size += item[0].shape[0]
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                break
+
+            futures = [future for _, future in batch]
+            try:
+                inputs = torch.cat([tensor for tensor, _ in batch]).to(self.device)
+                with self.lock or nullcontext(), torch.no_grad():
+                    outputs = self.model(inputs)
+                probabilities = torch.nn.functional.softmax(outputs, dim=1)
+
+                offset = 0
+                for tensor, future in batch:
+                    count = tensor.shape[0]
+                    future.set_result(probabilities[offset:offset + count])
+                    offset += count
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
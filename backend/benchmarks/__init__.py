@@ -0,0 +1 @@
+"""Offline benchmarks for the detection pipeline. Run from the backend directory, e.g. `python -m benchmarks.frame_sampler`."""
@@ -0,0 +1,75 @@
+"""Face detection throughput under concurrency for different detector pool sizes.
+
+Each run starts `--threads` workers that detect faces on the same frames;
+with a pool of one they serialize on a single MediaPipe graph, larger pools
+let them run side by side.
+
+Usage (from the backend directory):
+    python -m benchmarks.detector_pool [--sizes 1 2 4] [--threads 4] [--json results.json]
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from video_processor import VideoProcessor
+from detector_pool import DetectorPool
+from benchmarks.synthetic import make_image
+
+
+def run(processor: VideoProcessor, pool_size: int, threads: int, frames: list) -> dict:
+    processor.detector_pool.close()
+    processor.detector_pool = DetectorPool(processor.create_face_detector, max_size=pool_size)
+    # Create the instances up front so graph start-up isn't timed
+    warm = [processor.detector_pool.checkout() for _ in range(pool_size)]
+    for detector in warm:
+        processor.detector_pool.release(detector)
+
+    def work(_):
+        for frame in frames:
+            processor.detect_face_boxes(frame)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(work, range(threads)))
+    seconds = time.perf_counter() - start
+    total = threads * len(frames)
+    return {
+        "pool_size": pool_size,
+        "threads": threads,
+        "frames": total,
+        "seconds": round(seconds, 4),
+        "frames_per_second": round(total / seconds, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=32, help="Frames per thread")
+    parser.add_argument("--json", type=Path, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    processor = VideoProcessor()
+    if not processor.face_detection_available:
+        print("⚠️ MediaPipe is unavailable; nothing to measure")
+        return
+
+    frames = [make_image((1280, 720), seed) for seed in range(args.frames)]
+    results = [run(processor, size, args.threads, frames) for size in args.sizes]
+    processor.close()
+
+    print(f"{'pool':>5} {'threads':>8} {'frames/s':>9} {'speedup':>8}")
+    for row in results:
+        speedup = row["frames_per_second"] / results[0]["frames_per_second"]
+        print(f"{row['pool_size']:>5} {row['threads']:>8} {row['frames_per_second']:>9.1f} {speedup:>7.2f}x")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Face extraction cost per video with and without the face tracker.
+
+Synthetic faces may not be picked up by MediaPipe; pass --video with a real
+clip to also see how often the tracker keeps the face.
+
+Usage (from the backend directory):
+    python -m benchmarks.face_tracking [--video clip.mp4] [--frames 6 24 48] [--json results.json]
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import config
+from video_processor import VideoProcessor
+from benchmarks.synthetic import write_video
+
+
+def time_extraction(processor: VideoProcessor, frames: list, tracking: bool) -> dict:
+    config.FACE_TRACKING_ENABLED = tracking
+    tracker = processor.create_tracker()
+    start = time.perf_counter()
+    for frame in frames:
+        processor.extract_face(frame, tracker)
+    seconds = time.perf_counter() - start
+    return {
+        "tracking": tracking,
+        "seconds": round(seconds, 4),
+        "ms_per_frame": round(seconds * 1000 / len(frames), 3),
+        "detections": tracker.detections if tracker else len(frames),
+        "tracked": tracker.tracked if tracker else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", type=Path, help="Video to sample (default: synthetic)")
+    parser.add_argument("--frames", nargs="+", type=int, default=[6, 24, 48])
+    parser.add_argument("--json", type=Path, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    processor = VideoProcessor()
+    if not processor.face_detection_available:
+        print("⚠️ MediaPipe is unavailable; nothing to compare")
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = args.video or write_video(Path(tmp) / "synthetic.mp4", num_frames=600, size=(1280, 720))
+        for num_frames in args.frames:
+            frames, _ = processor.sample_frames(str(video_path), num_frames)
+            for tracking in (False, True):
+                results.append({"frames": len(frames), **time_extraction(processor, frames, tracking)})
+
+    print(f"{'frames':>6} {'tracking':>9} {'ms/frame':>9} {'detections':>11} {'tracked':>8}")
+    for row in results:
+        print(
+            f"{row['frames']:>6} {str(row['tracking']):>9} {row['ms_per_frame']:>9.2f} "
+            f"{row['detections']:>11} {row['tracked']:>8}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare frame sampler strategies on synthetic videos.
+
+Usage (from the backend directory):
+    python -m benchmarks.frame_sampler [--repeats 3] [--json results.json]
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from frame_sampler import sample_indices, read_frames, choose_strategy, SEQUENTIAL, SEEK, AUTO
+from benchmarks.synthetic import write_video
+
+# (label, strategy, max_gap); max_gap=0 reproduces the old seek-per-sample sampler
+STRATEGIES = [
+    ("seek-every-sample", SEEK, 0),
+    ("seek", SEEK, None),
+    ("sequential", SEQUENTIAL, None),
+    ("auto", AUTO, None),
+]
+
+VIDEO_LENGTHS = [300, 1800]
+SAMPLE_COUNTS = [6, 32, 120]
+
+
+def time_strategy(video_path: str, num_frames: int, strategy: str, max_gap, repeats: int):
+    """Return (best seconds, {index: frame}) for one strategy"""
+    best = float("inf")
+    frames = {}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cap = cv2.VideoCapture(video_path)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        indices = sample_indices(total, num_frames)
+        frames = dict(read_frames(cap, indices, strategy=strategy, max_gap=max_gap))
+        cap.release()
+        best = min(best, time.perf_counter() - start)
+    return best, frames
+
+
+def run(repeats: int = 3) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for length in VIDEO_LENGTHS:
+            video_path = str(write_video(Path(tmp) / f"synthetic_{length}.mp4", num_frames=length))
+            for num_frames in SAMPLE_COUNTS:
+                reference = None
+                for label, strategy, max_gap in STRATEGIES:
+                    seconds, frames = time_strategy(video_path, num_frames, strategy, max_gap, repeats)
+                    if reference is None:
+                        reference = frames
+                    identical = frames.keys() == reference.keys() and all(
+                        np.array_equal(frames[i], reference[i]) for i in frames
+                    )
+                    results.append({
+                        "video_frames": length,
+                        "samples": num_frames,
+                        "strategy": label,
+                        "auto_choice": choose_strategy(length, num_frames),
+                        "seconds": round(seconds, 4),
+                        "frames_read": len(frames),
+                        "matches_seek_every_sample": identical,
+                    })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.repeats)
+
+    print(f"{'frames':>7} {'samples':>7} {'strategy':<18} {'seconds':>8} {'read':>5} {'match':>6}")
+    for row in results:
+        print(
+            f"{row['video_frames']:>7} {row['samples']:>7} {row['strategy']:<18} "
+            f"{row['seconds']:>8.4f} {row['frames_read']:>5} {str(row['matches_seek_every_sample']):>6}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Accuracy drift and latency/throughput report for each inference backend.
+
+Drift is measured against the fp32 eager model. Pass --images with a folder
+of real face crops for meaningful numbers; without it synthetic images are
+used, which only checks that each backend runs and roughly agrees.
+
+Usage (from the backend directory):
+    python -m benchmarks.inference_backends [--images DIR] [--json report.json]
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+import config
+from model import DeepfakeDetector
+from image_io import decode_image
+from preprocessing import Preprocessor
+from inference_backends import create_backend, load_calibration_batches, BACKENDS, EAGER, QUANTIZED_STATIC
+from benchmarks.synthetic import make_image
+
+
+def load_inputs(images_dir: Path, count: int) -> torch.Tensor:
+    """Preprocessed evaluation batch from a folder of images, or synthetic images"""
+    if images_dir:
+        paths = sorted(
+            path for path in images_dir.iterdir()
+            if path.suffix.lower() in (".jpg", ".jpeg", ".png")
+        )[:count]
+        images = [decode_image(path.read_bytes()) for path in paths]
+    else:
+        images = [make_image(config.IMAGE_SIZE, seed) for seed in range(count)]
+    return Preprocessor()(images)
+
+
+def measure_latency(backend, inputs: torch.Tensor, batch_size: int, repeats: int) -> dict:
+    batch = inputs[:batch_size]
+    backend(batch)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        backend(batch)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings)
+    return {
+        "batch_size": batch_size,
+        "p50_ms": round(float(np.percentile(timings, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(timings, 95)) * 1000, 3),
+        "images_per_second": round(batch_size / float(np.median(timings)), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=Path, help="Folder of face crops for drift measurement")
+    parser.add_argument("--count", type=int, default=32, help="Number of evaluation images")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--json", type=Path, help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    detector = DeepfakeDetector()
+    inputs = load_inputs(args.images, args.count)
+    batch_size = min(config.BATCH_MAX_SIZE, len(inputs))
+
+    reference_backend = create_backend(detector.model, detector.device, EAGER)
+    reference = torch.softmax(reference_backend(inputs), dim=1)
+
+    report = []
+    for name in args.backends:
+        if name == QUANTIZED_STATIC and not load_calibration_batches():
+            print(f"⚠️ Skipping {name}: no calibration images in {config.QUANT_CALIBRATION_DIR}")
+            continue
+
+        backend = create_backend(detector.model, detector.device, name)
+        if backend.name != name:
+            print(f"⚠️ Skipping {name}: backend could not be set up")
+            continue
+
+        probabilities = torch.softmax(backend(inputs), dim=1)
+        difference = (probabilities - reference).abs()
+        row = {
+            "backend": name,
+            "max_abs_prob_diff": round(difference.max().item(), 6),
+            "mean_abs_prob_diff": round(difference.mean().item(), 6),
+            "label_agreement": round(
+                (probabilities.argmax(dim=1) == reference.argmax(dim=1)).float().mean().item(), 4
+            ),
+            "latency": [
+                measure_latency(backend, inputs, 1, args.repeats),
+                measure_latency(backend, inputs, batch_size, args.repeats),
+            ],
+        }
+        report.append(row)
+
+    print(f"{'backend':<18} {'max diff':>9} {'agree':>6} {'b1 p50 ms':>10} {'b' + str(batch_size) + ' img/s':>10}")
+    for row in report:
+        single, batched = row["latency"]
+        print(
+            f"{row['backend']:<18} {row['max_abs_prob_diff']:>9.5f} {row['label_agreement']:>6.1%} "
+            f"{single['p50_ms']:>10.2f} {batched['images_per_second']:>10.1f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"✅ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
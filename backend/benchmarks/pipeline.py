@@ -0,0 +1,202 @@
+"""Latency and throughput benchmarks for the detection pipeline, with run comparison.
+
+Runs offline on CPU against synthetic images and videos. Each case reports
+p50/p95/p99/mean latency and throughput; the end-to-end cases go through the
+FastAPI app with the ASGI test client (needs httpx) and bypass the result
+cache so every request does the full work.
+
+Usage (from the backend directory):
+    python -m benchmarks.pipeline run [--repeats 20] [--cases predict video_endpoint] [--json run.json]
+    python -m benchmarks.pipeline compare baseline.json run.json [--threshold 0.1] [--metric p95_ms]
+
+compare exits with status 1 when any case is slower than the baseline by
+more than the threshold (a fraction, 0.1 = 10%).
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+import cv2
+import numpy as np
+import torch
+
+import config
+from benchmarks.synthetic import make_image, write_image, write_video
+
+CASES = ("predict", "generate_heatmap", "sample_frames", "extract_face", "image_endpoint", "video_endpoint")
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "mean_ms")
+
+
+def measure(fn: Callable[[], object], repeats: int, warmup: int = 1, items: int = 1) -> dict:
+    """Time fn() `repeats` times after `warmup` untimed calls
+
+    items is the number of units one call processes, for throughput.
+    """
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    return {
+        "repeats": repeats,
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p95_ms": round(float(np.percentile(timings, 95)), 3),
+        "p99_ms": round(float(np.percentile(timings, 99)), 3),
+        "mean_ms": round(float(timings.mean()), 3),
+        "throughput_per_s": round(items * 1000 / float(timings.mean()), 3),
+    }
+
+
+def run_cases(cases: list, repeats: int, workdir: Path) -> Dict[str, dict]:
+    from model import get_detector
+    from gradcam import GradCAMExplainer
+    from video_processor import VideoProcessor
+
+    detector = get_detector()
+    explainer = GradCAMExplainer(detector.model, detector.device, lock=detector.model_lock)
+    video_processor = VideoProcessor()
+
+    image_path = write_image(workdir / "synthetic.jpg", size=(1280, 720))
+    video_path = write_video(workdir / "synthetic.mp4", num_frames=300, size=(1280, 720))
+    frame = make_image((1280, 720), seed=1)
+    heatmap_path = workdir / "heatmap.jpg"
+
+    results = {}
+    if "predict" in cases:
+        tensor = detector.preprocess_image(str(image_path))
+        results["predict"] = measure(lambda: detector.predict(tensor), repeats)
+    if "generate_heatmap" in cases:
+        results["generate_heatmap"] = measure(
+            lambda: explainer.generate_heatmap(str(image_path), str(heatmap_path)), repeats
+        )
+    if "sample_frames" in cases:
+        results["sample_frames"] = measure(
+            lambda: video_processor.sample_frames(str(video_path), config.MAX_FRAMES),
+            repeats,
+            items=config.MAX_FRAMES
+        )
+    if "extract_face" in cases:
+        results["extract_face"] = measure(lambda: video_processor.extract_face(frame), repeats)
+
+    endpoint_cases = [case for case in cases if case.endswith("_endpoint")]
+    if endpoint_cases:
+        results.update(run_endpoint_cases(endpoint_cases, repeats, image_path, video_path))
+    return results
+
+
+def run_endpoint_cases(cases: list, repeats: int, image_path: Path, video_path: Path) -> Dict[str, dict]:
+    from fastapi.testclient import TestClient
+    import app as app_module
+
+    # Every request should do the full work rather than hit the result cache
+    app_module.result_cache = None
+    client = TestClient(app_module.app)
+
+    def post(url: str, path: Path, content_type: str):
+        with open(path, "rb") as f:
+            response = client.post(url, files={"file": (path.name, f, content_type)})
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}: {response.text}")
+        file_id = response.json().get("file_id")
+        if file_id:
+            client.delete(f"/api/cleanup/{file_id}")
+
+    results = {}
+    if "image_endpoint" in cases:
+        results["image_endpoint"] = measure(
+            lambda: post("/api/analyze/image", image_path, "image/jpeg"), repeats
+        )
+    if "video_endpoint" in cases:
+        results["video_endpoint"] = measure(
+            lambda: post("/api/analyze/video", video_path, "video/mp4"), repeats
+        )
+    return results
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "opencv": cv2.__version__,
+        "inference_backend": config.INFERENCE_BACKEND,
+        "batching_enabled": config.BATCHING_ENABLED,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, metric: str) -> list:
+    """Rows of (case, baseline, current, relative change, regressed) for cases in both runs"""
+    rows = []
+    for case, base_stats in baseline["results"].items():
+        stats = current["results"].get(case)
+        if stats is None:
+            continue
+        change = (stats[metric] - base_stats[metric]) / base_stats[metric] if base_stats[metric] else 0.0
+        rows.append((case, base_stats[metric], stats[metric], change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--repeats", type=int, default=20)
+    run_parser.add_argument("--cases", nargs="+", default=list(CASES), choices=CASES)
+    run_parser.add_argument("--json", type=Path, help="Write the results to this JSON file")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two runs and flag regressions")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown as a fraction")
+    compare_parser.add_argument("--metric", default="p95_ms", choices=METRICS)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        torch.manual_seed(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            results = run_cases(args.cases, args.repeats, Path(tmp))
+        report = {"environment": environment(), "results": results}
+
+        print(f"{'case':<18} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'per s':>9}")
+        for case, stats in results.items():
+            print(
+                f"{case:<18} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+                f"{stats['p99_ms']:>10.2f} {stats['throughput_per_s']:>9.2f}"
+            )
+        if args.json:
+            args.json.write_text(json.dumps(report, indent=2))
+            print(f"✅ Results written to {args.json}")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    rows = compare(baseline, current, args.threshold, args.metric)
+
+    print(f"{'case':<18} {'baseline':>10} {'current':>10} {'change':>8}")
+    for case, base_value, value, change, regressed in rows:
+        flag = "  ❌ regression" if regressed else ""
+        print(f"{case:<18} {base_value:>10.2f} {value:>10.2f} {change:>+8.1%}{flag}")
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"❌ {len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%} ({args.metric})")
+        sys.exit(1)
+    print(f"✅ No regressions above {args.threshold:.0%} ({args.metric})")
+
+
+if __name__ == "__main__":
+    main()
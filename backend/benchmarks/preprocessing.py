@@ -0,0 +1,73 @@
+"""Check the vectorized Preprocessor against the torchvision transform chain and time both.
+
+Usage (from the backend directory):
+    python -m benchmarks.preprocessing [--repeats 20]
+"""
+import argparse
+import time
+
+import torch
+from PIL import Image
+from torchvision import transforms
+
+import config
+from preprocessing import Preprocessor
+from benchmarks.synthetic import make_image
+
+BATCH_SIZES = [1, 6, 32]
+
+
+def reference_transform():
+    """The transform chain previously used by the detector, explainer and video processor"""
+    return transforms.Compose([
+        transforms.Resize(config.IMAGE_SIZE),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=config.MEAN, std=config.STD)
+    ])
+
+
+def check_equivalence(preprocessor: Preprocessor, transform) -> float:
+    """Max absolute difference on inputs already at IMAGE_SIZE (expected to be 0)"""
+    images = [make_image(config.IMAGE_SIZE, seed) for seed in range(8)]
+    expected = torch.stack([transform(Image.fromarray(image)) for image in images])
+    actual = preprocessor(images)
+    return (expected - actual).abs().max().item()
+
+
+def best_time(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    preprocessor = Preprocessor()
+    transform = reference_transform()
+
+    max_diff = check_equivalence(preprocessor, transform)
+    status = "✅" if max_diff == 0 else "❌"
+    print(f"{status} Max abs difference vs torchvision at {config.IMAGE_SIZE}: {max_diff:.3e}")
+
+    print(f"{'batch':>5} {'torchvision ms':>15} {'vectorized ms':>14} {'speedup':>8}")
+    for batch_size in BATCH_SIZES:
+        images = [make_image(config.IMAGE_SIZE, seed) for seed in range(batch_size)]
+        reference = best_time(
+            lambda: torch.stack([transform(Image.fromarray(image)) for image in images]),
+            args.repeats
+        )
+        vectorized = best_time(lambda: preprocessor(images), args.repeats)
+        print(
+            f"{batch_size:>5} {reference * 1000:>15.3f} {vectorized * 1000:>14.3f} "
+            f"{reference / vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Uniform vs scene-aware adaptive frame selection: decode cost and shot coverage.
+
+The synthetic video has shots of uneven length, including a one-second
+shot that evenly spaced samples tend to miss. Coverage is the fraction of
+shots with at least one sample; duplicates counts sampled pairs whose
+signatures are within SCENE_DEDUP_THRESHOLD of each other.
+
+"adaptive" is the single pass VideoProcessor uses, which keeps the chosen
+frames from the scene analysis pass; "two_pass" decodes them again from a
+second capture, as frame selection did before. Decoded counts the frames
+grabbed or read through the capture (a seek also decodes up to one GOP
+inside OpenCV, which is not counted).
+
+Usage (from the backend directory):
+    python -m benchmarks.scene_sampler [--budgets 6 12 24] [--repeats 3] [--json results.json]
+"""
+import argparse
+import bisect
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+import config
+from frame_sampler import sample_indices, read_frames
+from scene_sampler import adaptive_frames, frame_signature, signature_distance
+from benchmarks.synthetic import write_video
+
+NUM_FRAMES = 900
+CUTS = [240, 270, 520, 700, 715]
+
+
+SELECTIONS = ("uniform", "two_pass", "adaptive")
+
+
+class CountingCapture:
+    """VideoCapture wrapper counting the frames decoded through grab() and read()"""
+
+    def __init__(self, video_path: str):
+        self.cap = cv2.VideoCapture(video_path)
+        self.decoded = 0
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def grab(self):
+        self.decoded += 1
+        return self.cap.grab()
+
+    def read(self):
+        self.decoded += 1
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+def sample(video_path: str, budget: int, selection: str) -> tuple:
+    """Return ({index: frame}, frames decoded) for one selection method"""
+    cap = CountingCapture(video_path)
+    try:
+        if selection == "uniform":
+            frames = dict(read_frames(cap, sample_indices(NUM_FRAMES, budget)))
+        else:
+            frames = dict(adaptive_frames(cap, budget))
+    finally:
+        cap.release()
+    decoded = cap.decoded
+
+    if selection == "two_pass":
+        cap = CountingCapture(video_path)
+        try:
+            frames = dict(read_frames(cap, sorted(frames)))
+        finally:
+            cap.release()
+        decoded += cap.decoded
+    return frames, decoded
+
+
+def evaluate(video_path: str, budget: int, selection: str, repeats: int) -> dict:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        frames, decoded = sample(video_path, budget, selection)
+        best = min(best, time.perf_counter() - start)
+
+    shots = {bisect.bisect_right(CUTS, index) for index in frames}
+    signatures = np.stack([frame_signature(frames[index]) for index in sorted(frames)])
+    distances = signature_distance(signatures[:, None, :], signatures[None, :, :])
+    duplicates = int((np.triu(distances <= config.SCENE_DEDUP_THRESHOLD, k=1)).sum())
+    return {
+        "selection": selection,
+        "budget": budget,
+        "frames": len(frames),
+        "decoded": decoded,
+        "seconds": round(best, 4),
+        "shot_coverage": round(len(shots) / (len(CUTS) + 1), 3),
+        "duplicates": duplicates,
+        "indices": sorted(frames),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budgets", nargs="+", type=int, default=[6, 12, 24])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = str(write_video(Path(tmp) / "shots.mp4", num_frames=NUM_FRAMES, cuts=CUTS))
+        for budget in args.budgets:
+            for selection in SELECTIONS:
+                results.append(evaluate(video_path, budget, selection, args.repeats))
+
+    print(f"{'budget':>6} {'selection':>9} {'frames':>6} {'decoded':>7} {'seconds':>8} {'coverage':>9} {'dupes':>6}")
+    for row in results:
+        print(
+            f"{row['budget']:>6} {row['selection']:>9} {row['frames']:>6} {row['decoded']:>7} {row['seconds']:>8.3f} "
+            f"{row['shot_coverage']:>9.0%} {row['duplicates']:>6}"
+        )
+
+    # Saving of the single pass over decoding the chosen frames a second time
+    by_key = {(row["budget"], row["selection"]): row for row in results}
+    for budget in args.budgets:
+        single, double = by_key[(budget, "adaptive")], by_key[(budget, "two_pass")]
+        print(
+            f"budget {budget}: single pass saves {double['decoded'] - single['decoded']} decoded frames, "
+            f"{double['seconds'] - single['seconds']:.3f}s"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
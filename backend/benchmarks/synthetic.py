@@ -0,0 +1,65 @@
+"""Synthetic images and videos generated with OpenCV for offline benchmarks."""
+import cv2
+import numpy as np
+from pathlib import Path
+
+
+def make_image(size: tuple = (640, 480), seed: int = 0) -> np.ndarray:
+    """Generate an RGB image with a face-like ellipse on a noisy background"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    image = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    image = cv2.GaussianBlur(image, (15, 15), 0)
+    center = (width // 2, height // 2)
+    axes = (width // 6, height // 4)
+    cv2.ellipse(image, center, axes, 0, 0, 360, (224, 172, 140), -1)
+    cv2.circle(image, (center[0] - axes[0] // 2, center[1] - axes[1] // 4), axes[0] // 8, (40, 40, 40), -1)
+    cv2.circle(image, (center[0] + axes[0] // 2, center[1] - axes[1] // 4), axes[0] // 8, (40, 40, 40), -1)
+    return image
+
+
+def write_image(path: Path, size: tuple = (640, 480), seed: int = 0) -> Path:
+    """Write a synthetic image to disk as JPEG"""
+    path = Path(path)
+    cv2.imwrite(str(path), cv2.cvtColor(make_image(size, seed), cv2.COLOR_RGB2BGR))
+    return path
+
+
+def write_video(
+    path: Path,
+    num_frames: int = 300,
+    size: tuple = (640, 480),
+    fps: float = 30.0,
+    scene_length: int = 0,
+    seed: int = 0,
+    cuts: list = None
+) -> Path:
+    """Write a synthetic video with a moving face-like blob
+
+    Args:
+        path: Output path (.mp4 or .avi)
+        num_frames: Number of frames to write
+        size: Frame size as (width, height)
+        fps: Frames per second
+        scene_length: Switch to a new background every N frames (0 disables cuts)
+        seed: Random seed for the backgrounds
+        cuts: Explicit frame indices at which to switch background, for uneven shots
+
+    Returns:
+        Path to the written video
+    """
+    path = Path(path)
+    fourcc = cv2.VideoWriter_fourcc(*("mp4v" if path.suffix == ".mp4" else "MJPG"))
+    writer = cv2.VideoWriter(str(path), fourcc, fps, size)
+    width, height = size
+
+    background = make_image(size, seed)
+    for i in range(num_frames):
+        if (scene_length and i > 0 and i % scene_length == 0) or (cuts and i in cuts):
+            background = make_image(size, seed + i)
+        frame = np.roll(background, shift=i * 2, axis=1)
+        cv2.putText(frame, str(i), (10, height - 10), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+
+    writer.release()
+    return path
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+import config
+
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobStore(ABC):
+    """Content-addressed storage for rendered assets such as frame thumbnails
+
+    Keys are the SHA-256 of the content, so identical thumbnails are stored
+    once and the key doubles as a strong ETag.
+    """
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """Store the bytes and return their key"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes, or None if the key is unknown"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Filesystem path of the blob, for stores that keep blobs on local disk"""
+        return None
+
+    def url(self, key: str) -> str:
+        """Public URL the API serves the blob from"""
+        return f"/api/blobs/{key}"
+
+    @staticmethod
+    def make_key(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def is_valid_key(key: str) -> bool:
+        return bool(KEY_PATTERN.match(key))
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store backed by a directory on the local filesystem"""
+
+    def __init__(self, root: Path = None, suffix: str = ".jpg"):
+        self.root = Path(root or config.BLOB_DIR)
+        self.suffix = suffix
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{key}{self.suffix}"
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self.path(key)
+
+    def put(self, data: bytes) -> str:
+        key = self.make_key(data)
+        path = self.path(key)
+        if not path.exists():
+            # Write to a temp name first so readers never see a partial file
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.is_valid_key(key):
+            return None
+        try:
+            return self.path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, key: str) -> bool:
+        return self.is_valid_key(key) and self.path(key).exists()
+
+    def delete(self, key: str):
+        if self.is_valid_key(key):
+            self.path(key).unlink(missing_ok=True)
+
+
+# Global instance
+blob_store = None
+
+def get_blob_store() -> BlobStore:
+    """Get or create the blob store instance"""
+    global blob_store
+    if blob_store is None:
+        blob_store = LocalBlobStore()
+    return blob_store
@@ -12,24 +12,126 @@ MODEL_PATH = BASE_DIR / "models" / "best_efficientnet_b0.pth"
 MODEL_NAME = "efficientnet_b0"
 NUM_CLASSES = 2
 
+# Inference backend for verdicts: eager, torchscript, quantized_dynamic,
+# quantized_static or onnx (Grad-CAM always uses the eager model)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "eager")
+TORCHSCRIPT_MODEL_PATH = BASE_DIR / "models" / "efficientnet_b0.torchscript.pt"
+ONNX_MODEL_PATH = BASE_DIR / "models" / "efficientnet_b0.onnx"
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", 0))  # 0 lets ONNX Runtime decide
+QUANT_CALIBRATION_DIR = BASE_DIR / "models" / "calibration"
+QUANT_CALIBRATION_SAMPLES = int(os.getenv("QUANT_CALIBRATION_SAMPLES", 64))
+
 # Upload configuration
 UPLOAD_DIR = BASE_DIR / "uploads"
 TEMP_DIR = BASE_DIR / "temp"
 RESULTS_DIR = BASE_DIR / "results"
+CACHE_DIR = BASE_DIR / "cache"
+BLOB_DIR = RESULTS_DIR / "blobs"  # content-addressed frame thumbnails
+
+# Upload limits
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+MAX_IMAGE_UPLOAD_BYTES = int(os.getenv("MAX_IMAGE_UPLOAD_MB", 20)) * 1024 * 1024
+MAX_VIDEO_UPLOAD_BYTES = int(os.getenv("MAX_VIDEO_UPLOAD_MB", 500)) * 1024 * 1024
 
 # Create directories
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(TEMP_DIR, exist_ok=True)
 os.makedirs(RESULTS_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
+os.makedirs(BLOB_DIR, exist_ok=True)
 
 # Image processing
 IMAGE_SIZE = (224, 224)
 MEAN = [0.485, 0.456, 0.406]
 STD = [0.229, 0.224, 0.225]
+IMAGE_DRAFT_DECODE = os.getenv("IMAGE_DRAFT_DECODE", "true").lower() == "true"  # reduced-size JPEG decoding
 
 # Video processing
-MAX_FRAMES = 6
+MAX_FRAMES = int(os.getenv("MAX_FRAMES", 6))
 VIDEO_SAMPLE_FRAMES = 5
+VIDEO_BATCH_SIZE = int(os.getenv("VIDEO_BATCH_SIZE", 16))  # frames per batched forward pass
+FRAME_SAMPLER_STRATEGY = os.getenv("FRAME_SAMPLER_STRATEGY", "auto")  # auto, sequential or seek
+FRAME_SAMPLER_MAX_GAP = int(os.getenv("FRAME_SAMPLER_MAX_GAP", 60))  # roughly one GOP
+# Frame selection: "uniform" spaces samples evenly; "adaptive" computes cheap
+# signatures for SCENE_SAMPLER_CANDIDATES frames, splits the video into shots
+# and spreads the MAX_FRAMES budget across them, skipping near-duplicates
+FRAME_SELECTION = os.getenv("FRAME_SELECTION", "uniform")
+SCENE_SAMPLER_CANDIDATES = int(os.getenv("SCENE_SAMPLER_CANDIDATES", 240))
+SCENE_CUT_THRESHOLD = float(os.getenv("SCENE_CUT_THRESHOLD", 0.35))  # signature distance in [0, 1]
+SCENE_DEDUP_THRESHOLD = float(os.getenv("SCENE_DEDUP_THRESHOLD", 0.02))
+SCENE_SAMPLER_KEEP_BYTES = int(os.getenv("SCENE_SAMPLER_KEEP_MB", 512)) * 1024 * 1024  # candidate frames held for reuse
+# Face tracking: run MediaPipe every N sampled frames (and on scene cuts or a
+# weak template match) and follow the face by template matching in between
+FACE_TRACKING_ENABLED = os.getenv("FACE_TRACKING_ENABLED", "false").lower() == "true"
+FACE_TRACK_DETECT_EVERY = int(os.getenv("FACE_TRACK_DETECT_EVERY", 5))
+FACE_TRACK_MIN_SCORE = float(os.getenv("FACE_TRACK_MIN_SCORE", 0.6))  # normalized cross-correlation
+FACE_TRACK_SCENE_CUT_THRESHOLD = float(os.getenv("FACE_TRACK_SCENE_CUT_THRESHOLD", 0.5))  # histogram correlation
+MULTI_FACE_MIN_SIZE = int(os.getenv("MULTI_FACE_MIN_SIZE", 40))  # px; smaller faces are skipped in multi-face mode
+MULTI_FACE_MAX_FACES = int(os.getenv("MULTI_FACE_MAX_FACES", 8))  # per frame, largest detections first
+# Video verdict aggregation over per-frame probabilities: vote (majority of
+# argmax labels), mean_log_odds, trimmed_mean, top_k or ema
+VIDEO_AGGREGATION = os.getenv("VIDEO_AGGREGATION", "vote")
+AGGREGATION_TRIM = float(os.getenv("AGGREGATION_TRIM", 0.1))  # fraction dropped at each end
+AGGREGATION_TOP_K = int(os.getenv("AGGREGATION_TOP_K", 3))
+AGGREGATION_EMA_ALPHA = float(os.getenv("AGGREGATION_EMA_ALPHA", 0.5))
+AGGREGATION_UNCERTAIN_MARGIN = float(os.getenv("AGGREGATION_UNCERTAIN_MARGIN", 0.05))  # around 0.5
+# Early exit: evaluate frames coarse to fine and stop once a sequential
+# probability ratio test on the accumulated per-frame log-odds is decided
+EARLY_EXIT_ENABLED = os.getenv("EARLY_EXIT_ENABLED", "false").lower() == "true"
+EARLY_EXIT_ALPHA = float(os.getenv("EARLY_EXIT_ALPHA", 0.05))  # tolerated rate of wrong FAKE verdicts
+EARLY_EXIT_BETA = float(os.getenv("EARLY_EXIT_BETA", 0.05))  # tolerated rate of wrong REAL verdicts
+EARLY_EXIT_MIN_FRAMES = int(os.getenv("EARLY_EXIT_MIN_FRAMES", 3))
+EARLY_EXIT_MAX_FRAME_LOG_ODDS = float(os.getenv("EARLY_EXIT_MAX_FRAME_LOG_ODDS", 1.5))  # per-frame evidence cap
+EARLY_EXIT_BATCH_SIZE = int(os.getenv("EARLY_EXIT_BATCH_SIZE", 2))  # frames per forward pass between checks
+
+# Inference executor
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", 2))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", 8))
+INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", 60))
+IMAGE_TIMEOUT = float(os.getenv("IMAGE_TIMEOUT", 30))
+VIDEO_TIMEOUT = float(os.getenv("VIDEO_TIMEOUT", 300))
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", 5))
+FACE_DETECTOR_POOL_SIZE = int(os.getenv("FACE_DETECTOR_POOL_SIZE", INFERENCE_WORKERS))  # MediaPipe instances
+
+# Micro-batching of concurrent predictions
+BATCHING_ENABLED = os.getenv("BATCHING_ENABLED", "true").lower() == "true"
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 8))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", 5))
+
+# Startup warm-up
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_BATCH_SIZES = [
+    int(size) for size in
+    os.getenv("WARMUP_BATCH_SIZES", f"1,{MAX_FRAMES},{BATCH_MAX_SIZE}").split(",")
+]
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", 600))
+
+# Result cache for repeated uploads
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_MEMORY_ITEMS = int(os.getenv("RESULT_CACHE_MEMORY_ITEMS", 256))
+RESULT_CACHE_DISK_BYTES = int(os.getenv("RESULT_CACHE_DISK_MB", 200)) * 1024 * 1024
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", 24 * 60 * 60))
+
+# On-demand Grad-CAM: analyses skip heatmaps unless ?explain=true and keep
+# their preprocessed inputs in memory so /api/explain can render them later
+EXPLAIN_CACHE_TTL_SECONDS = float(os.getenv("EXPLAIN_CACHE_TTL_SECONDS", 15 * 60))
+EXPLAIN_CACHE_MAX_BYTES = int(os.getenv("EXPLAIN_CACHE_MAX_MB", 256)) * 1024 * 1024
+
+# Results lifecycle: heatmaps and thumbnails unused for the TTL are removed,
+# then the least recently used ones until the directory fits the quota
+RESULTS_SWEEPER_ENABLED = os.getenv("RESULTS_SWEEPER_ENABLED", "true").lower() == "true"
+RESULTS_TTL_SECONDS = float(os.getenv("RESULTS_TTL_SECONDS", 24 * 60 * 60))
+RESULTS_MAX_BYTES = int(os.getenv("RESULTS_MAX_MB", 1024)) * 1024 * 1024
+RESULTS_SWEEP_INTERVAL = float(os.getenv("RESULTS_SWEEP_INTERVAL", 300))
+TEMP_FILE_TTL_SECONDS = float(os.getenv("TEMP_FILE_TTL_SECONDS", 60 * 60))  # orphaned uploads
+
+# Prometheus metrics at /metrics; when disabled, timers and counters are no-ops
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Asynchronous video jobs; set JOBS_DB_PATH to keep jobs across restarts
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH")
+JOBS_TTL_SECONDS = float(os.getenv("JOBS_TTL_SECONDS", 24 * 60 * 60))
+JOBS_PROGRESS_PERSIST_INTERVAL = float(os.getenv("JOBS_PROGRESS_PERSIST_INTERVAL", 1.0))  # seconds between progress writes
 
 # Class names
 CLASS_NAMES = {0: "fake", 1: "real"}
@@ -0,0 +1,102 @@
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Generic, List, TypeVar
+
+import config
+
+T = TypeVar("T")
+
+
+class DetectorPool(Generic[T]):
+    """Bounded pool of detector instances with checkout/return semantics
+
+    MediaPipe graphs must not be called from two threads at once, so each
+    inference worker checks out its own instance instead of serializing on a
+    shared one. Instances are created lazily up to max_size (by default the
+    number of inference workers); a checkout beyond that waits for one to be
+    returned. close() closes idle instances at once and busy ones as they
+    are returned.
+    """
+
+    def __init__(self, factory: Callable[[], T], max_size: int = None, initial: List[T] = None):
+        self.factory = factory
+        self.max_size = max(1, max_size or config.FACE_DETECTOR_POOL_SIZE)
+        self._idle = queue.LifoQueue()  # most recently used first, so warm instances are reused
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+        for detector in initial or []:
+            self._idle.put(detector)
+            self._created += 1
+
+    @property
+    def created(self) -> int:
+        return self._created
+
+    @property
+    def in_use(self) -> int:
+        return self._created - self._idle.qsize()
+
+    def checkout(self, timeout: float = None) -> T:
+        """Take an idle instance, create one if below max_size, or wait for a return
+
+        Raises queue.Empty if none becomes available within the timeout.
+        """
+        if self._closed:
+            raise RuntimeError("DetectorPool is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.max_size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        return self._idle.get(timeout=timeout)
+
+    def release(self, detector: T):
+        """Return an instance to the pool"""
+        if self._closed:
+            self._close_instance(detector)
+            return
+        self._idle.put(detector)
+
+    @contextmanager
+    def acquire(self, timeout: float = None):
+        """`with pool.acquire() as detector:` checks out an instance for the block"""
+        detector = self.checkout(timeout)
+        try:
+            yield detector
+        finally:
+            self.release(detector)
+
+    def close(self):
+        """Close every instance; ones still checked out are closed on return"""
+        self._closed = True
+        while True:
+            try:
+                self._close_instance(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _close_instance(self, detector: T):
+        with self._lock:
+            self._created -= 1
+        close = getattr(detector, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                print(f"⚠️ Error closing detector: {e}")
@@ -0,0 +1,86 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import config
+
+
+class ExecutorBusyError(Exception):
+    """Raised when the inference queue is full"""
+
+
+class InferenceExecutor:
+    """Bounded thread pool that keeps blocking inference off the event loop
+
+    A thread pool (rather than a process pool) is used so the model weights,
+    Grad-CAM hooks and face detectors are loaded once and shared; PyTorch,
+    OpenCV and MediaPipe release the GIL inside their native kernels.
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = None):
+        self.max_workers = max_workers or config.INFERENCE_WORKERS
+        self.max_queue = config.INFERENCE_QUEUE_SIZE if max_queue is None else max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs running or waiting in the queue"""
+        return self._pending
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue a blocking callable without awaiting it
+
+        Raises ExecutorBusyError when the queue is full.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise ExecutorBusyError("Inference queue is full")
+            self._pending += 1
+
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """Run a blocking callable on the pool and await its result
+
+        Raises ExecutorBusyError when the queue is full and asyncio.TimeoutError
+        when the job does not finish within the timeout. A timed-out job that
+        has not started yet is cancelled; one that is already running is left
+        to finish and still counts against the queue until it does.
+        """
+        future = self.submit(fn, *args, **kwargs)
+
+        if timeout is None:
+            timeout = config.INFERENCE_TIMEOUT
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    def shutdown(self):
+        """Stop accepting work and cancel queued jobs"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance
+inference_executor = None
+
+def get_executor() -> InferenceExecutor:
+    """Get or create executor instance"""
+    global inference_executor
+    if inference_executor is None:
+        inference_executor = InferenceExecutor()
+    return inference_executor
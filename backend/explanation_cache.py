@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import torch
+
+import config
+
+
+class ExplanationCache:
+    """Short-lived in-memory cache of model inputs for on-demand Grad-CAM
+
+    Analyses store the preprocessed tensor of every image or video frame
+    they classified, keyed by file id and frame number (0 for images), so
+    /api/explain can run Grad-CAM later without the upload. The rendered
+    overlay is memoized next to its tensor. Entries expire ttl_seconds after
+    they were stored; past max_bytes the least recently used frames are
+    evicted first.
+    """
+
+    def __init__(self, ttl_seconds: float = None, max_bytes: int = None):
+        self.ttl_seconds = config.EXPLAIN_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_bytes = config.EXPLAIN_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+        self._lock = threading.Lock()
+        # (file id, frame) -> [stored_at, tensor, overlay JPEG or None], least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _size(entry: list) -> int:
+        _, tensor, overlay = entry
+        return tensor.element_size() * tensor.nelement() + (len(overlay) if overlay else 0)
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+
+    def put(self, file_id: str, frame: int, tensor: torch.Tensor):
+        """Keep the 1xCxHxW (or CxHxW) input of one image or frame"""
+        # Copy so a row of a larger batch does not keep the whole batch alive
+        tensor = tensor.detach().cpu().reshape(1, *tensor.shape[-3:]).clone()
+        entry = [time.time(), tensor, None]
+        with self._lock:
+            self._drop((file_id, frame))
+            self._entries[(file_id, frame)] = entry
+            self._bytes += self._size(entry)
+            self._evict()
+
+    def _get(self, file_id: str, frame: int) -> Optional[list]:
+        key = (file_id, frame)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry[0]):
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, file_id: str, frame: int) -> Optional[torch.Tensor]:
+        with self._lock:
+            entry = self._get(file_id, frame)
+            return entry[1] if entry is not None else None
+
+    def get_overlay(self, file_id: str, frame: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._get(file_id, frame)
+            return entry[2] if entry is not None else None
+
+    def put_overlay(self, file_id: str, frame: int, overlay: bytes):
+        """Memoize the rendered overlay; ignored if the tensor was evicted meanwhile"""
+        with self._lock:
+            entry = self._get(file_id, frame)
+            if entry is None or entry[2] is not None:
+                return
+            entry[2] = overlay
+            self._bytes += len(overlay)
+            self._evict()
+
+    def discard(self, file_id: str):
+        """Forget every frame of a file"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == file_id]:
+                self._drop(key)
+
+    def _drop(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= self._size(entry)
+
+    def _evict(self):
+        now = time.time()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if self._bytes <= self.max_bytes and not (self.ttl_seconds > 0 and now - entry[0] > self.ttl_seconds):
+                break
+            self._drop(key)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"frames": len(self._entries), "bytes": self._bytes}
+
+
+# Global instance
+explanation_cache = None
+
+
+def get_explanation_cache() -> ExplanationCache:
+    """Get or create the explanation cache"""
+    global explanation_cache
+    if explanation_cache is None:
+        explanation_cache = ExplanationCache()
+    return explanation_cache
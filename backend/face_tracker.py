@@ -0,0 +1,129 @@
+from typing import Callable, List, Optional
+
+import cv2
+import numpy as np
+
+import config
+from metrics import stage_timer, FACE_TRACKER
+from scene_sampler import luma_histogram
+
+# Frames are matched at this width; enough detail for a face template and
+# far cheaper than matching at full resolution
+TRACK_WIDTH = 320
+
+Box = List[int]  # [x1, y1, x2, y2] in pixels
+
+
+class FaceTracker:
+    """Follows one face through a video's sampled frames with few detector calls
+
+    Full detection runs on the first frame, every detect_every frames, after
+    a scene cut (luma histogram correlation below scene_cut_threshold) and
+    whenever tracking loses confidence. In between, the last face is found
+    again by normalized cross-correlation of its template inside a search
+    window around the previous box; a match scoring below min_score counts
+    as lost and triggers a re-detection. A tracker holds per-video state, so
+    create one per video.
+    """
+
+    def __init__(
+        self,
+        detect_fn: Callable[[np.ndarray], Optional[Box]],
+        detect_every: int = None,
+        min_score: float = None,
+        scene_cut_threshold: float = None,
+        search_margin: float = 0.5
+    ):
+        self.detect_fn = detect_fn
+        self.detect_every = max(1, detect_every or config.FACE_TRACK_DETECT_EVERY)
+        self.min_score = config.FACE_TRACK_MIN_SCORE if min_score is None else min_score
+        self.scene_cut_threshold = (
+            config.FACE_TRACK_SCENE_CUT_THRESHOLD if scene_cut_threshold is None else scene_cut_threshold
+        )
+        self.search_margin = search_margin
+
+        self.box: Optional[Box] = None
+        self._template = None
+        self._histogram = None
+        self._since_detection = 0
+        self.detections = 0
+        self.tracked = 0
+
+    def _small_gray(self, frame: np.ndarray) -> tuple[np.ndarray, float]:
+        scale = min(1.0, TRACK_WIDTH / frame.shape[1])
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else frame
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY), scale
+
+    def _detect(self, frame: np.ndarray, gray: np.ndarray, scale: float, outcome: str) -> Optional[Box]:
+        self.detections += 1
+        self._since_detection = 0
+        self.box = self.detect_fn(frame)
+        FACE_TRACKER.inc(outcome=outcome)
+        self._set_template(gray, scale)
+        return self.box
+
+    def _set_template(self, gray: np.ndarray, scale: float):
+        self._template = None
+        if self.box is None:
+            return
+        x1, y1, x2, y2 = (int(round(v * scale)) for v in self.box)
+        template = gray[y1:y2, x1:x2]
+        if min(template.shape[:2], default=0) >= 8:
+            self._template = template
+
+    def _match(self, gray: np.ndarray, scale: float) -> Optional[Box]:
+        """Locate the template near the previous box; None when the match is weak"""
+        height, width = self._template.shape
+        x1, y1, x2, y2 = (int(round(v * scale)) for v in self.box)
+        margin_x = int(width * self.search_margin)
+        margin_y = int(height * self.search_margin)
+        sx1, sy1 = max(0, x1 - margin_x), max(0, y1 - margin_y)
+        sx2, sy2 = min(gray.shape[1], x2 + margin_x), min(gray.shape[0], y2 + margin_y)
+        window = gray[sy1:sy2, sx1:sx2]
+        if window.shape[0] < height or window.shape[1] < width:
+            return None
+
+        with stage_timer("face_tracking"):
+            scores = cv2.matchTemplate(window, self._template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (dx, dy) = cv2.minMaxLoc(scores)
+        if score < self.min_score:
+            return None
+
+        left, top = sx1 + dx, sy1 + dy
+        return [
+            int(round(left / scale)),
+            int(round(top / scale)),
+            int(round((left + width) / scale)),
+            int(round((top + height) / scale)),
+        ]
+
+    def update(self, frame: np.ndarray) -> Optional[Box]:
+        """Face box for the next sampled RGB frame, or None if no face was found"""
+        gray, scale = self._small_gray(frame)
+        histogram = luma_histogram(gray)
+        previous_histogram, self._histogram = self._histogram, histogram
+
+        if previous_histogram is None or self._since_detection + 1 >= self.detect_every:
+            return self._detect(frame, gray, scale, "detected")
+
+        if cv2.compareHist(previous_histogram, histogram, cv2.HISTCMP_CORREL) < self.scene_cut_threshold:
+            return self._detect(frame, gray, scale, "scene_cut")
+
+        if self._template is None:
+            # No face (or one too small to match) at the last detection; keep
+            # that result until the next scheduled detection
+            self._since_detection += 1
+            FACE_TRACKER.inc(outcome="held")
+            return self.box
+
+        box = self._match(gray, scale)
+        if box is None:
+            return self._detect(frame, gray, scale, "lost")
+
+        self._since_detection += 1
+        self.tracked += 1
+        FACE_TRACKER.inc(outcome="tracked")
+        self.box = box
+        # Refresh the template so slow changes in pose and lighting don't accumulate
+        self._set_template(gray, scale)
+        return box
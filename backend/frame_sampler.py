@@ -0,0 +1,94 @@
+import cv2
+import numpy as np
+from typing import Iterator, List, Tuple
+import config
+
+SEQUENTIAL = "sequential"
+SEEK = "seek"
+AUTO = "auto"
+STRATEGIES = (SEQUENTIAL, SEEK, AUTO)
+
+
+def sample_indices(total_frames: int, num_frames: int) -> List[int]:
+    """Evenly spaced frame indices over the video"""
+    if total_frames > num_frames:
+        return np.linspace(0, total_frames - 1, num_frames, dtype=int).tolist()
+    return list(range(total_frames))
+
+
+def choose_strategy(total_frames: int, num_frames: int, max_gap: int = None) -> str:
+    """Pick a decode strategy from the frame count and sample density
+
+    Sequential decoding pays for every frame up to the last sample, while a
+    seek pays for a keyframe seek plus up to one GOP of decoding per sample.
+    When samples are closer together than about a GOP, decoding straight
+    through is cheaper.
+    """
+    if max_gap is None:
+        max_gap = config.FRAME_SAMPLER_MAX_GAP
+    if num_frames <= 0 or total_frames <= num_frames:
+        return SEQUENTIAL
+    gap = total_frames / num_frames
+    return SEQUENTIAL if gap <= max_gap else SEEK
+
+
+def _read_sequential(cap: cv2.VideoCapture, indices: List[int]) -> Iterator[Tuple[int, np.ndarray]]:
+    """Decode straight through, only converting the frames that are kept"""
+    position = 0
+    for target in sorted(set(indices)):
+        while position < target:
+            # grab() decodes without the colour conversion done by retrieve()
+            if not cap.grab():
+                return
+            position += 1
+        ret, frame = cap.read()
+        position += 1
+        if not ret:
+            return
+        yield target, frame
+
+
+def _read_seek(cap: cv2.VideoCapture, indices: List[int], max_gap: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """Seek for long jumps and grab forward for short ones"""
+    position = 0
+    for target in sorted(set(indices)):
+        if position is None or target < position or target - position > max_gap:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            position = target
+        while position < target:
+            if not cap.grab():
+                break
+            position += 1
+        ret, frame = cap.read()
+        if not ret:
+            # Position is unknown after a failed read, so seek for the next sample
+            position = None
+            continue
+        position = target + 1
+        yield target, frame
+
+
+def read_frames(
+    cap: cv2.VideoCapture,
+    indices: List[int],
+    strategy: str = None,
+    max_gap: int = None
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield (frame index, BGR frame) for the requested indices in ascending order
+
+    The capture must be freshly opened. Indices that cannot be decoded are
+    skipped.
+    """
+    if strategy is None:
+        strategy = config.FRAME_SAMPLER_STRATEGY
+    if max_gap is None:
+        max_gap = config.FRAME_SAMPLER_MAX_GAP
+    if strategy == AUTO:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        strategy = choose_strategy(total_frames, len(indices), max_gap)
+
+    if strategy == SEQUENTIAL:
+        return _read_sequential(cap, indices)
+    if strategy == SEEK:
+        return _read_seek(cap, indices, max_gap)
+    raise ValueError(f"Unknown frame sampler strategy: {strategy}")
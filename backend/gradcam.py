@@ -4,48 +4,152 @@ from PIL import Image
 from pytorch_grad_cam import GradCAM
 from pytorch_grad_cam.utils.model_targets import ClassifierOutputTarget
 from pytorch_grad_cam.utils.image import show_cam_on_image
-from torchvision import transforms
 import cv2
+import threading
 from pathlib import Path
 import config
+from model import build_prediction
+from image_io import decode_image
+from preprocessing import Preprocessor
+from metrics import stage_timer, ERRORS
 
 class GradCAMExplainer:
-    def __init__(self, model, device):
+    def __init__(self, model, device, lock: threading.Lock = None):
         self.model = model
         self.device = device
         # Target the last convolutional layer
         self.target_layers = [model.conv_head]
-        self.cam = GradCAM(model=model, target_layers=self.target_layers)
+        # While a CAM call has its hooks on the model they fire on every
+        # forward pass, so pass the detector's model lock to keep CAM calls
+        # from interleaving with other inference threads
+        self._lock = lock or threading.Lock()
         
-        self.transform = transforms.Compose([
-            transforms.Resize(config.IMAGE_SIZE),
-            transforms.ToTensor(),
-            transforms.Normalize(mean=config.MEAN, std=config.STD)
-        ])
+        self.preprocessor = Preprocessor()
+    
+    def run_cam(self, input_tensor: torch.Tensor, targets=None) -> tuple[np.ndarray, torch.Tensor]:
+        """Run one Grad-CAM pass and return (cams, logits); call with the model lock held
+        
+        The hooks are registered for this call only and released afterwards.
+        Left on conv_head, every plain forward pass (backends, micro-batcher)
+        would append its activations to the CAM's list until the next CAM call.
+        """
+        with GradCAM(model=self.model, target_layers=self.target_layers) as cam:
+            grayscale_cams = cam(input_tensor=input_tensor, targets=targets)
+            return grayscale_cams, cam.outputs.detach()
+    
+    def explain_tensor(self, input_tensor: torch.Tensor) -> tuple[np.ndarray, torch.Tensor]:
+        """Run Grad-CAM for the predicted class and return (cams, probabilities)
+        
+        The CAM pass already runs the forward pass that picks the target class,
+        so its logits are reused for the probabilities instead of running the
+        model a second time.
+        """
+        with self._lock, stage_timer("gradcam"):
+            grayscale_cams, outputs = self.run_cam(input_tensor)
+            probabilities = torch.nn.functional.softmax(outputs, dim=1)
+        return grayscale_cams, probabilities
+    
+    def explain_batch(self, input_tensor: torch.Tensor, images: list) -> tuple[list, torch.Tensor]:
+        """Generate heatmaps and probabilities for a batch of frames in one forward/backward pass"""
+        grayscale_cams, probabilities = self.explain_tensor(input_tensor)
+        
+        visualizations = []
+        with stage_timer("heatmap_overlay"):
+            for image, grayscale_cam in zip(images, grayscale_cams):
+                img_resized = cv2.resize(image, config.IMAGE_SIZE)
+                img_normalized = img_resized.astype(np.float32) / 255.0
+                visualizations.append(show_cam_on_image(
+                    img_normalized,
+                    grayscale_cam,
+                    use_rgb=True
+                ))
+        
+        return visualizations, probabilities
+    
+    def render_explanation(self, input_tensor: torch.Tensor) -> bytes:
+        """Grad-CAM overlay of one preprocessed 1xCxHxW input, as JPEG bytes
+        
+        The overlay's base image is recovered by undoing the input
+        normalization, so only the tensor needs to be kept around.
+        """
+        grayscale_cams, _ = self.explain_tensor(input_tensor.to(self.device))
+        
+        with stage_timer("heatmap_overlay"):
+            image = input_tensor[0].cpu() * self.preprocessor.std[0] + self.preprocessor.mean[0]
+            img_normalized = image.clamp(0, 1).permute(1, 2, 0).numpy().astype(np.float32)
+            visualization = show_cam_on_image(
+                img_normalized,
+                grayscale_cams[0],
+                use_rgb=True
+            )
+        
+        with stage_timer("jpeg_encode"):
+            _, buffer = cv2.imencode('.jpg', cv2.cvtColor(visualization, cv2.COLOR_RGB2BGR))
+        return buffer.tobytes()
+    
+    def predict_and_explain(self, image: np.ndarray, output_path: str) -> dict:
+        """Predict and generate Grad-CAM heatmap from a single forward/backward pass
+        
+        `image` is the decoded RGB uint8 array at the model input size; it is
+        shared by the model input and the heatmap overlay.
+        """
+        with stage_timer("preprocessing"):
+            input_tensor = self.preprocessor(image).to(self.device)
+        
+        grayscale_cams = None
+        try:
+            grayscale_cams, probabilities = self.explain_tensor(input_tensor)
+        except Exception as e:
+            print(f"⚠️ Error generating heatmap: {e}")
+            ERRORS.inc(stage="gradcam")
+            with self._lock, stage_timer("forward"), torch.no_grad():
+                outputs = self.model(input_tensor)
+                probabilities = torch.nn.functional.softmax(outputs, dim=1)
+        
+        result = build_prediction(probabilities[0])
+        result["heatmap_path"] = None
+        
+        if grayscale_cams is not None:
+            try:
+                with stage_timer("heatmap_overlay"):
+                    img_normalized = image.astype(np.float32) / 255.0
+                    visualization = show_cam_on_image(
+                        img_normalized,
+                        grayscale_cams[0],
+                        use_rgb=True
+                    )
+                
+                output_path = Path(output_path)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with stage_timer("jpeg_encode"):
+                    Image.fromarray(visualization).save(output_path)
+                result["heatmap_path"] = str(output_path)
+            except Exception as e:
+                print(f"⚠️ Error saving heatmap: {e}")
+                ERRORS.inc(stage="heatmap_save")
+        
+        return result
     
     def generate_heatmap(self, image_path: str, output_path: str) -> dict:
         """Generate Grad-CAM heatmap for the given image"""
         try:
             # Load and preprocess image
-            image = Image.open(image_path).convert("RGB")
-            input_tensor = self.transform(image).unsqueeze(0).to(self.device)
+            image = decode_image(Path(image_path).read_bytes())
+            input_tensor = self.preprocessor(image).to(self.device)
             
             # Get prediction
-            with torch.no_grad():
+            with self._lock, torch.no_grad():
                 outputs = self.model(input_tensor)
                 pred_class = outputs.argmax(dim=1).item()
                 confidence = torch.nn.functional.softmax(outputs, dim=1)[0][pred_class].item()
             
             # Generate Grad-CAM
             targets = [ClassifierOutputTarget(pred_class)]
-            grayscale_cam = self.cam(
-                input_tensor=input_tensor,
-                targets=targets
-            )[0]
+            with self._lock:
+                grayscale_cam = self.run_cam(input_tensor, targets)[0][0]
             
             # Prepare image for overlay
-            img_array = np.array(image.resize(config.IMAGE_SIZE))
-            img_normalized = img_array.astype(np.float32) / 255.0
+            img_normalized = image.astype(np.float32) / 255.0
             
             # Create visualization
             visualization = show_cam_on_image(
@@ -76,16 +180,14 @@ class GradCAMExplainer:
         """Generate heatmap from tensor (for video frames)"""
         try:
             # Get prediction
-            with torch.no_grad():
+            with self._lock, torch.no_grad():
                 outputs = self.model(image_tensor)
                 pred_class = outputs.argmax(dim=1).item()
             
             # Generate Grad-CAM
             targets = [ClassifierOutputTarget(pred_class)]
-            grayscale_cam = self.cam(
-                input_tensor=image_tensor,
-                targets=targets
-            )[0]
+            with self._lock:
+                grayscale_cam = self.run_cam(image_tensor, targets)[0][0]
             
             # Resize original image to match model input
             img_resized = cv2.resize(original_image, config.IMAGE_SIZE)
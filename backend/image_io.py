@@ -0,0 +1,29 @@
+import numpy as np
+from io import BytesIO
+from PIL import Image
+from typing import Union
+import config
+from metrics import stage_timer
+
+
+def decode_image(buffer: Union[bytes, memoryview], size: tuple = None, draft: bool = None) -> np.ndarray:
+    """Decode an encoded image buffer once into an RGB uint8 array at the model input size
+
+    For JPEGs, draft mode lets libjpeg scale the DCT down by up to 8x while
+    decoding, so a large photo is never fully decoded just to be shrunk to
+    224 px. The result feeds both the model and the heatmap overlay.
+    """
+    size = size or config.IMAGE_SIZE
+    if draft is None:
+        draft = config.IMAGE_DRAFT_DECODE
+
+    with stage_timer("decode"):
+        image = Image.open(BytesIO(buffer))
+        if draft and image.format == "JPEG":
+            # Picks the smallest scale that is still at least `size`
+            image.draft("RGB", size)
+
+        image = image.convert("RGB")
+        if image.size != tuple(size):
+            image = image.resize(size, Image.BILINEAR)
+        return np.asarray(image)
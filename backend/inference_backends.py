@@ -0,0 +1,229 @@
+import copy
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+import config
+
+EAGER = "eager"
+TORCHSCRIPT = "torchscript"
+QUANTIZED_DYNAMIC = "quantized_dynamic"
+QUANTIZED_STATIC = "quantized_static"
+ONNX = "onnx"
+BACKENDS = (EAGER, TORCHSCRIPT, QUANTIZED_DYNAMIC, QUANTIZED_STATIC, ONNX)
+
+
+def file_sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class InferenceBackend(ABC):
+    """Runs verdict-only forward passes and returns logits on the CPU
+
+    Grad-CAM needs gradients through the original module, so explanations
+    always use the eager model; backends only serve plain predictions.
+    """
+
+    name = "base"
+    # Identifies what the backend loaded beyond the eager weights (an exported
+    # graph, calibration data), so cached verdicts follow a change of numerics
+    artifact = ""
+
+    def fingerprint(self) -> str:
+        return f"{self.name}:{self.artifact}" if self.artifact else self.name
+
+    @abstractmethod
+    def __call__(self, inputs: torch.Tensor) -> torch.Tensor:
+        ...
+
+
+class EagerBackend(InferenceBackend):
+    """The fp32 PyTorch model as-is"""
+
+    name = EAGER
+
+    def __init__(self, model: nn.Module, device, lock: threading.Lock = None):
+        self.model = model
+        self.device = device
+        # The eager model carries the Grad-CAM hooks, so share the model lock
+        self.lock = lock
+
+    def __call__(self, inputs: torch.Tensor) -> torch.Tensor:
+        with self.lock or nullcontext(), torch.no_grad():
+            return self.model(inputs.to(self.device)).cpu()
+
+
+class TorchScriptBackend(InferenceBackend):
+    """Frozen TorchScript graph, loaded from TORCHSCRIPT_MODEL_PATH or traced at startup"""
+
+    name = TORCHSCRIPT
+
+    def __init__(self, model: nn.Module, device, path: Path = None):
+        self.device = device
+        path = Path(path or config.TORCHSCRIPT_MODEL_PATH)
+
+        if path.exists():
+            module = torch.jit.load(str(path), map_location=device)
+            self.artifact = file_sha256(path)
+            print(f"✅ TorchScript model loaded from {path}")
+        else:
+            height, width = config.IMAGE_SIZE[1], config.IMAGE_SIZE[0]
+            example = torch.zeros((1, 3, height, width), device=device)
+            with torch.no_grad():
+                module = torch.jit.trace(copy.deepcopy(model).eval(), example)
+            self.artifact = "traced"
+            print("✅ TorchScript model traced from the eager model")
+
+        self.module = torch.jit.optimize_for_inference(torch.jit.freeze(module.eval()))
+
+    def __call__(self, inputs: torch.Tensor) -> torch.Tensor:
+        with torch.no_grad():
+            return self.module(inputs.to(self.device)).cpu()
+
+
+class QuantizedBackend(InferenceBackend):
+    """int8 model on the CPU, either dynamic or static with a calibration step
+
+    Dynamic quantization only covers nn.Linear, which for EfficientNet is just
+    the classifier head, so it mostly trims memory. Static quantization also
+    converts the convolutions (FX graph mode, x86 kernels) and needs a few
+    dozen representative face crops to calibrate activation ranges.
+    """
+
+    def __init__(self, model: nn.Module, static: bool = False,
+                 calibration_batches: Optional[List[torch.Tensor]] = None):
+        model = copy.deepcopy(model).cpu().eval()
+
+        if not static:
+            self.name = QUANTIZED_DYNAMIC
+            self.module = torch.ao.quantization.quantize_dynamic(
+                model, {nn.Linear}, dtype=torch.qint8
+            )
+            return
+
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+        self.name = QUANTIZED_STATIC
+        if calibration_batches is None:
+            calibration_batches = load_calibration_batches()
+            self.artifact = calibration_fingerprint()
+        else:
+            self.artifact = "custom-calibration"
+        if not calibration_batches:
+            raise RuntimeError(f"No calibration images found in {config.QUANT_CALIBRATION_DIR}")
+
+        torch.backends.quantized.engine = "x86"
+        prepared = prepare_fx(
+            model,
+            get_default_qconfig_mapping("x86"),
+            example_inputs=(calibration_batches[0],)
+        )
+        with torch.no_grad():
+            for batch in calibration_batches:
+                prepared(batch)
+        self.module = convert_fx(prepared)
+
+    def __call__(self, inputs: torch.Tensor) -> torch.Tensor:
+        with torch.no_grad():
+            return self.module(inputs.cpu())
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime on the CPU, using the graph exported by src/models/export.py"""
+
+    name = ONNX
+
+    def __init__(self, path: Path = None):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("onnxruntime is not installed (pip install onnxruntime)") from e
+
+        path = Path(path or config.ONNX_MODEL_PATH)
+        if not path.exists():
+            raise RuntimeError(f"ONNX model not found at {path}; export it with `python -m src.models.export`")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if config.ONNX_THREADS:
+            options.intra_op_num_threads = config.ONNX_THREADS
+        self.session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.artifact = file_sha256(path)
+        print(f"✅ ONNX model loaded from {path}")
+
+    def __call__(self, inputs: torch.Tensor) -> torch.Tensor:
+        array = np.ascontiguousarray(inputs.detach().cpu().numpy(), dtype=np.float32)
+        logits = self.session.run(None, {self.input_name: array})[0]
+        return torch.from_numpy(logits)
+
+
+def calibration_paths(directory: Path = None, max_samples: int = None) -> List[Path]:
+    """Face crops used to calibrate static quantization"""
+    directory = Path(directory or config.QUANT_CALIBRATION_DIR)
+    max_samples = max_samples or config.QUANT_CALIBRATION_SAMPLES
+    if not directory.exists():
+        return []
+
+    return sorted(
+        path for path in directory.iterdir()
+        if path.suffix.lower() in (".jpg", ".jpeg", ".png")
+    )[:max_samples]
+
+
+def calibration_fingerprint(directory: Path = None, max_samples: int = None) -> str:
+    """Hash of the calibration images; static quantization numerics depend on them"""
+    hasher = hashlib.sha256()
+    for path in calibration_paths(directory, max_samples):
+        hasher.update(f"{path.name}:{file_sha256(path)}".encode())
+    return hasher.hexdigest()
+
+
+def load_calibration_batches(directory: Path = None, max_samples: int = None,
+                             batch_size: int = 8) -> List[torch.Tensor]:
+    """Preprocess face crops from the calibration directory into batches"""
+    from image_io import decode_image
+    from preprocessing import Preprocessor
+
+    paths = calibration_paths(directory, max_samples)
+    images = [decode_image(path.read_bytes()) for path in paths]
+
+    preprocessor = Preprocessor()
+    return [
+        preprocessor(images[start:start + batch_size])
+        for start in range(0, len(images), batch_size)
+    ]
+
+
+def create_backend(model: nn.Module, device, name: str = None,
+                   lock: threading.Lock = None) -> InferenceBackend:
+    """Build the configured backend, falling back to eager PyTorch if it cannot be set up"""
+    name = name or config.INFERENCE_BACKEND
+    try:
+        if name == EAGER:
+            return EagerBackend(model, device, lock=lock)
+        if name == TORCHSCRIPT:
+            return TorchScriptBackend(model, device)
+        if name == QUANTIZED_DYNAMIC:
+            return QuantizedBackend(model)
+        if name == QUANTIZED_STATIC:
+            return QuantizedBackend(model, static=True)
+        if name == ONNX:
+            return OnnxBackend()
+        raise ValueError(f"Unknown inference backend: {name} (expected one of {', '.join(BACKENDS)})")
+    except Exception as e:
+        print(f"⚠️ Could not set up {name} inference backend: {e}")
+        print(f"⚠️ INFERENCE_BACKEND={name} has no effect; falling back to eager PyTorch")
+        return EagerBackend(model, device, lock=lock)
@@ -0,0 +1,214 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import config
+from executor import InferenceExecutor, ExecutorBusyError
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+FINISHED = (COMPLETED, FAILED)
+
+
+class JobStore:
+    """In-process job records with optional SQLite persistence
+
+    Records are plain dicts. With a database path every status change is
+    written through, so finished results and queued work survive a restart;
+    progress updates are written at most every progress_persist_interval
+    seconds. Callers always get copies, so a record can be serialized while
+    a worker thread keeps updating it.
+    """
+
+    def __init__(self, db_path: Path = None, ttl_seconds: float = None,
+                 progress_persist_interval: float = None):
+        self.ttl_seconds = config.JOBS_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.progress_persist_interval = (
+            config.JOBS_PROGRESS_PERSIST_INTERVAL if progress_persist_interval is None else progress_persist_interval
+        )
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, dict] = {}
+        self._progress_persisted_at: Dict[str, float] = {}
+        self._db = None
+
+        if db_path:
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, updated_at REAL NOT NULL, data TEXT NOT NULL)"
+            )
+            self._db.commit()
+            for (data,) in self._db.execute("SELECT data FROM jobs"):
+                job = json.loads(data)
+                self._jobs[job["id"]] = job
+
+    @staticmethod
+    def _snapshot(job: dict) -> dict:
+        """Copy of a record, including the nested progress dict the worker mutates"""
+        snapshot = dict(job)
+        snapshot["progress"] = {stage: dict(progress) for stage, progress in job["progress"].items()}
+        return snapshot
+
+    def _persist(self, job: dict):
+        self._progress_persisted_at[job["id"]] = time.time()
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs (id, status, updated_at, data) VALUES (?, ?, ?, ?)",
+            (job["id"], job["status"], job["updated_at"], json.dumps(job))
+        )
+        self._db.commit()
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL"""
+        if self.ttl_seconds <= 0:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in FINISHED and job["updated_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._progress_persisted_at.pop(job_id, None)
+        if expired and self._db is not None:
+            self._db.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in expired])
+            self._db.commit()
+
+    def create(self, job_id: str, kind: str, meta: dict = None) -> dict:
+        now = time.time()
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "status": QUEUED,
+            "stage": None,
+            "progress": {},
+            "result": None,
+            "error": None,
+            "meta": meta or {},
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = job
+            self._persist(job)
+        return self._snapshot(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job is not None else None
+
+    def update(self, job_id: str, **fields) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.update(fields)
+            job["updated_at"] = time.time()
+            self._persist(job)
+            return self._snapshot(job)
+
+    def set_progress(self, job_id: str, stage: str, done: int, total: int):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["stage"] = stage
+            job["progress"][stage] = {"done": done, "total": total}
+            job["updated_at"] = time.time()
+            # Progress arrives per frame, so only the end of a stage and one
+            # update per interval are written; status changes always are
+            since_persist = job["updated_at"] - self._progress_persisted_at.get(job_id, 0)
+            if done >= total or since_persist >= self.progress_persist_interval:
+                self._persist(job)
+
+    def delete(self, job_id: str):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._progress_persisted_at.pop(job_id, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                self._db.commit()
+
+    def unfinished(self) -> List[dict]:
+        with self._lock:
+            return [self._snapshot(job) for job in self._jobs.values() if job["status"] not in FINISHED]
+
+
+class JobManager:
+    """Runs jobs on the shared inference executor and records their progress
+
+    process_fn(job, progress_callback) does the work and returns the
+    JSON-serializable result; progress_callback(stage, done, total) matches
+    VideoProcessor.process_video. Jobs share the executor's bounded queue,
+    so a full queue rejects new jobs with ExecutorBusyError.
+    """
+
+    def __init__(self, store: JobStore, executor: InferenceExecutor,
+                 process_fn: Callable[[dict, Callable], dict]):
+        self.store = store
+        self.executor = executor
+        self.process_fn = process_fn
+
+    def submit(self, job: dict) -> dict:
+        """Queue a job created in the store; removes it again if the queue is full"""
+        try:
+            self.executor.submit(self._run, job["id"])
+        except ExecutorBusyError:
+            self.store.delete(job["id"])
+            raise
+        return job
+
+    def resume(self):
+        """Requeue jobs left unfinished by a previous process"""
+        for job in self.store.unfinished():
+            video_path = job["meta"].get("video_path")
+            if not video_path or not Path(video_path).exists():
+                self.store.update(job["id"], status=FAILED, error="Job input was lost in a restart")
+                continue
+            try:
+                self.store.update(job["id"], status=QUEUED, stage=None, progress={})
+                self.executor.submit(self._run, job["id"])
+                print(f"🔁 Resumed job {job['id']}")
+            except ExecutorBusyError:
+                self.store.update(job["id"], status=FAILED, error="Queue was full when resuming after a restart")
+
+    def _run(self, job_id: str):
+        job = self.store.update(job_id, status=RUNNING)
+        if job is None:
+            return
+
+        def progress(stage: str, done: int, total: int):
+            self.store.set_progress(job_id, stage, done, total)
+
+        try:
+            result = self.process_fn(job, progress)
+            self.store.update(job_id, status=COMPLETED, result=result)
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=str(e))
+        finally:
+            video_path = job["meta"].get("video_path")
+            if video_path:
+                Path(video_path).unlink(missing_ok=True)
+
+
+def job_status(job: dict) -> dict:
+    """Public view of a job record, without internal metadata or the result payload"""
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "result_url": f"/api/jobs/{job['id']}/result" if job["status"] == COMPLETED else None,
+    }
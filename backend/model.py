@@ -1,53 +1,76 @@
 import torch
 import torch.nn as nn
 import timm
-from torchvision import transforms
-from PIL import Image
 import numpy as np
 from pathlib import Path
+import threading
+from functools import lru_cache
 import config
+from batcher import MicroBatcher
+from inference_backends import create_backend, file_sha256
+from image_io import decode_image
+from preprocessing import Preprocessor
+from metrics import stage_timer
 
 class DeepfakeDetector:
     def __init__(self):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model = None
-        self.transform = self._get_transform()
+        # Set by load_model to the weights that were actually loaded
+        self.weights = None
+        self.preprocessor = Preprocessor()
+        # PyTorch already spreads one forward pass across all cores, so model
+        # calls (plain and Grad-CAM) are serialized on this lock
+        self.model_lock = threading.Lock()
+        self.batcher = None
         self.load_model()
-    
-    def _get_transform(self):
-        """Get image preprocessing transforms"""
-        return transforms.Compose([
-            transforms.Resize(config.IMAGE_SIZE),
-            transforms.ToTensor(),
-            transforms.Normalize(mean=config.MEAN, std=config.STD)
-        ])
+        
+        # Verdict-only predictions go through the configured backend; Grad-CAM
+        # keeps using the eager model
+        self.backend = create_backend(self.model, self.device, lock=self.model_lock)
+        print(f"✅ Inference backend: {self.backend.name}")
+        
+        if config.BATCHING_ENABLED:
+            self.batcher = MicroBatcher(self.backend, self.device)
     
     def load_model(self):
         """Load the trained EfficientNet model"""
         try:
-            # Create model architecture
+            has_checkpoint = config.MODEL_PATH.exists()
+            
+            # Create model architecture; ImageNet weights are only fetched when
+            # there is no fine-tuned checkpoint to load over them
             self.model = timm.create_model(
                 config.MODEL_NAME,
-                pretrained=True,  # Use pretrained as fallback
+                pretrained=not has_checkpoint,
                 num_classes=config.NUM_CLASSES
             )
             
             # Load trained weights if they exist
-            if config.MODEL_PATH.exists():
+            if has_checkpoint:
                 try:
                     checkpoint = torch.load(
                         config.MODEL_PATH,
                         map_location=self.device
                     )
                     self.model.load_state_dict(checkpoint["model_state_dict"])
+                    self.weights = f"{config.MODEL_NAME}:{file_sha256(config.MODEL_PATH)}"
                     print(f"✅ Model loaded from {config.MODEL_PATH}")
                 except Exception as load_err:
                     print(f"⚠️ Error loading model weights: {load_err}")
                     print("   Using pretrained model instead")
+                    self.model = timm.create_model(
+                        config.MODEL_NAME,
+                        pretrained=True,
+                        num_classes=config.NUM_CLASSES
+                    )
             else:
                 print(f"⚠️ Warning: Model weights not found at {config.MODEL_PATH}")
                 print("   Using pretrained model. Upload your trained model for better accuracy.")
             
+            if self.weights is None:
+                self.weights = f"pretrained:{config.MODEL_NAME}"
+            
             self.model = self.model.to(self.device)
             self.model.eval()
             
@@ -55,42 +78,79 @@ class DeepfakeDetector:
             print(f"❌ Error loading model: {e}")
             raise
     
+    def fingerprint(self) -> str:
+        """Identify what produces verdicts: the weights that were loaded
+        (checkpoint hash, or the pretrained model name when there is no
+        usable checkpoint) and the inference backend with the hash of its
+        exported graph or calibration data
+        """
+        return f"{self.weights}|{self.backend.fingerprint()}"
+    
+    def warmup(self, batch_sizes: list = None):
+        """Run dummy forward passes so first requests don't pay for lazy allocations"""
+        batch_sizes = batch_sizes or config.WARMUP_BATCH_SIZES
+        height, width = config.IMAGE_SIZE[1], config.IMAGE_SIZE[0]
+        for batch_size in batch_sizes:
+            dummy = torch.zeros((batch_size, 3, height, width), device=self.device)
+            self.backend(dummy)
+    
     def preprocess_image(self, image_path: str) -> torch.Tensor:
         """Preprocess image for model input"""
-        image = Image.open(image_path).convert("RGB")
-        image_tensor = self.transform(image).unsqueeze(0)
-        return image_tensor.to(self.device)
+        image = decode_image(Path(image_path).read_bytes())
+        return self.preprocess_array(image)
+    
+    def preprocess_array(self, image: np.ndarray) -> torch.Tensor:
+        """Preprocess an already decoded RGB uint8 array for model input"""
+        with stage_timer("preprocessing"):
+            return self.preprocessor(image).to(self.device)
     
     def predict(self, image_tensor: torch.Tensor) -> dict:
         """Make prediction on preprocessed image"""
-        with torch.no_grad():
-            outputs = self.model(image_tensor)
-            probabilities = torch.nn.functional.softmax(outputs, dim=1)
-            confidence, predicted = torch.max(probabilities, 1)
-            
-            pred_class = predicted.item()
-            conf_score = confidence.item() * 100
-            
-            return {
-                "prediction": config.CLASS_NAMES[pred_class],
-                "confidence": round(conf_score, 2),
-                "probabilities": {
-                    "fake": round(probabilities[0][0].item() * 100, 2),
-                    "real": round(probabilities[0][1].item() * 100, 2)
-                }
-            }
+        with stage_timer("forward"):
+            if self.batcher is not None:
+                probabilities = self.batcher.predict(image_tensor)
+            else:
+                outputs = self.backend(image_tensor)
+                probabilities = torch.nn.functional.softmax(outputs, dim=1)
+        return build_prediction(probabilities[0])
     
     def predict_from_file(self, image_path: str) -> dict:
         """Complete prediction pipeline from file"""
         image_tensor = self.preprocess_image(image_path)
         return self.predict(image_tensor)
 
+def build_prediction(probabilities: torch.Tensor) -> dict:
+    """Build the prediction dict from a single row of class probabilities"""
+    confidence, predicted = torch.max(probabilities, 0)
+    
+    pred_class = predicted.item()
+    conf_score = confidence.item() * 100
+    
+    return {
+        "prediction": config.CLASS_NAMES[pred_class],
+        "confidence": round(conf_score, 2),
+        "probabilities": {
+            "fake": round(probabilities[0].item() * 100, 2),
+            "real": round(probabilities[1].item() * 100, 2)
+        }
+    }
+
+@lru_cache(maxsize=1)
+def model_fingerprint() -> str:
+    """Fingerprint of the shared detector, for result cache keys"""
+    return get_detector().fingerprint()
+
 # Global instance
 detector = None
+# Cache lookups, warm-up and request handlers can all ask for the detector
+# first; loading it twice would load the weights and build the backend twice
+detector_lock = threading.Lock()
 
 def get_detector() -> DeepfakeDetector:
     """Get or create detector instance"""
     global detector
     if detector is None:
-        detector = DeepfakeDetector()
+        with detector_lock:
+            if detector is None:
+                detector = DeepfakeDetector()
     return detector
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+import config
+
+
+class ResultCache:
+    """Two-tier cache of analysis responses keyed by upload content and model
+
+    The memory tier is a small LRU of recent responses. The disk tier stores
+    one JSON file per key under CACHE_DIR and is bounded by total size and
+    TTL; its index is built with one directory scan at startup and then kept
+    up to date in memory, so evictions never rescan the directory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = None,
+        memory_items: int = None,
+        disk_max_bytes: int = None,
+        ttl_seconds: float = None
+    ):
+        self.cache_dir = Path(cache_dir or config.CACHE_DIR)
+        self.memory_items = config.RESULT_CACHE_MEMORY_ITEMS if memory_items is None else memory_items
+        self.disk_max_bytes = config.RESULT_CACHE_DISK_BYTES if disk_max_bytes is None else disk_max_bytes
+        self.ttl_seconds = config.RESULT_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (stored_at, value)
+        self._disk = OrderedDict()    # key -> size in bytes, least recently used first
+        self._disk_bytes = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_disk_index()
+
+    @staticmethod
+    def make_key(kind: str, content_sha256: str, model_fingerprint: str) -> str:
+        """Cache key for an upload of the given kind ("image" or "video")"""
+        return hashlib.sha256(f"{kind}:{content_sha256}:{model_fingerprint}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load_disk_index(self):
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+
+    def get(self, key: str, validate: Callable[[dict], bool] = None) -> Optional[dict]:
+        """Return the cached value, or None on a miss
+
+        Entries that are expired or rejected by validate (e.g. because the
+        heatmap they point to was cleaned up) are dropped.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self._expired(stored_at) and (validate is None or validate(value)):
+                    self._memory.move_to_end(key)
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    return value
+                self._drop(key)
+                return None
+
+            if key not in self._disk:
+                return None
+
+            path = self._path(key)
+            try:
+                entry = json.loads(path.read_text())
+                stored_at, value = entry["stored_at"], entry["value"]
+            except (OSError, ValueError, KeyError):
+                self._drop(key)
+                return None
+
+            if self._expired(stored_at) or (validate is not None and not validate(value)):
+                self._drop(key)
+                return None
+
+            # Touch for LRU ordering across restarts
+            os.utime(path, None)
+            self._disk.move_to_end(key)
+            self._remember(key, stored_at, value)
+            return value
+
+    def put(self, key: str, value: dict):
+        """Store a JSON-serializable value in both tiers"""
+        stored_at = time.time()
+        data = json.dumps({"stored_at": stored_at, "value": value})
+
+        with self._lock:
+            self._remember(key, stored_at, value)
+
+            path = self._path(key)
+            tmp_path = path.with_suffix(".tmp")
+            try:
+                tmp_path.write_text(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                tmp_path.unlink(missing_ok=True)
+                print(f"⚠️ Could not write result cache entry: {e}")
+                return
+
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def _remember(self, key: str, stored_at: float, value: dict):
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _drop(self, key: str):
+        self._memory.pop(key, None)
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+            self._path(key).unlink(missing_ok=True)
+
+    def _evict_disk(self):
+        while self._disk and self._disk_bytes > self.disk_max_bytes:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._memory.pop(key, None)
+            self._path(key).unlink(missing_ok=True)
+
+
+# Global instance
+result_cache = None
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get or create the result cache, or None when caching is disabled"""
+    global result_cache
+    if result_cache is None and config.RESULT_CACHE_ENABLED:
+        result_cache = ResultCache()
+    return result_cache
@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable
+
+import config
+
+
+class ResultsSweeper:
+    """Bounds the results directory by age and total size
+
+    Every file under the results directory (heatmaps and thumbnail blobs) is
+    tracked in an in-memory index ordered by last access. The index is built
+    with one directory scan at startup and kept current by track() whenever a
+    result is written or served, so sweeps walk the index instead of the
+    directory: files not accessed within the TTL are removed first, then the
+    least recently used ones until the total is under the quota.
+
+    The temp directory is swept for upload files orphaned by a crashed
+    request. Those are only removed once they are older than the temp TTL and
+    not reported as in use by active_paths (e.g. inputs of queued jobs).
+    """
+
+    def __init__(
+        self,
+        results_dir: Path = None,
+        temp_dir: Path = None,
+        ttl_seconds: float = None,
+        max_bytes: int = None,
+        temp_ttl_seconds: float = None,
+        interval_seconds: float = None,
+        active_paths: Callable[[], Iterable[str]] = None
+    ):
+        self.results_dir = Path(results_dir or config.RESULTS_DIR)
+        self.temp_dir = Path(temp_dir or config.TEMP_DIR)
+        self.ttl_seconds = config.RESULTS_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_bytes = config.RESULTS_MAX_BYTES if max_bytes is None else max_bytes
+        self.temp_ttl_seconds = config.TEMP_FILE_TTL_SECONDS if temp_ttl_seconds is None else temp_ttl_seconds
+        self.interval_seconds = config.RESULTS_SWEEP_INTERVAL if interval_seconds is None else interval_seconds
+        self.active_paths = active_paths
+
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # path -> size in bytes, least recently accessed first
+        self._accessed: Dict[Path, float] = {}
+        self._total_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._metrics = {
+            "sweeps": 0,
+            "files_removed": {"ttl": 0, "quota": 0, "temp": 0},
+            "bytes_reclaimed": {"ttl": 0, "quota": 0, "temp": 0},
+            "last_sweep_at": None,
+            "last_sweep_seconds": None,
+        }
+
+        self._load_index()
+
+    @staticmethod
+    def _is_hidden(path: Path) -> bool:
+        """Dotfiles such as the git-tracked .gitkeep are never swept"""
+        return path.name.startswith(".")
+
+    def _load_index(self):
+        entries = []
+        for path in self.results_dir.rglob("*"):
+            if self._is_hidden(path):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                entries.append((max(stat.st_atime, stat.st_mtime), path, stat.st_size))
+        for accessed, path, size in sorted(entries):
+            self._index[path] = size
+            self._accessed[path] = accessed
+            self._total_bytes += size
+
+    def track(self, path):
+        """Record that a result file was written or served"""
+        path = Path(path)
+        if self._is_hidden(path):
+            return
+        with self._lock:
+            if path in self._index:
+                self._index.move_to_end(path)
+                self._accessed[path] = time.time()
+                return
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            self._total_bytes -= self._index.pop(path, 0)
+            self._index[path] = size
+            self._accessed[path] = time.time()
+            self._total_bytes += size
+
+    def forget(self, path):
+        """Drop a file from the index after it was deleted elsewhere"""
+        path = Path(path)
+        with self._lock:
+            size = self._index.pop(path, None)
+            if size is not None:
+                self._accessed.pop(path, None)
+                self._total_bytes -= size
+
+    def _evict(self, path: Path, reason: str):
+        """Remove an indexed file; the caller holds the lock"""
+        size = self._index.pop(path)
+        self._accessed.pop(path, None)
+        self._total_bytes -= size
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"⚠️ Could not remove {path.name}: {e}")
+            return
+        self._metrics["files_removed"][reason] += 1
+        self._metrics["bytes_reclaimed"][reason] += size
+
+    def _sweep_results(self):
+        with self._lock:
+            if self.ttl_seconds > 0:
+                cutoff = time.time() - self.ttl_seconds
+                while self._index:
+                    path = next(iter(self._index))
+                    if self._accessed[path] >= cutoff:
+                        break
+                    self._evict(path, "ttl")
+
+            if self.max_bytes > 0:
+                while self._index and self._total_bytes > self.max_bytes:
+                    self._evict(next(iter(self._index)), "quota")
+
+    def _sweep_temp(self):
+        active = {str(Path(path)) for path in (self.active_paths() if self.active_paths else [])}
+        cutoff = time.time() - self.temp_ttl_seconds
+        for path in self.temp_dir.iterdir():
+            if str(path) in active or self._is_hidden(path) or not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+                if stat.st_mtime >= cutoff:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            with self._lock:
+                self._metrics["files_removed"]["temp"] += 1
+                self._metrics["bytes_reclaimed"]["temp"] += stat.st_size
+
+    def sweep(self) -> dict:
+        """Run one sweep now and return the updated metrics"""
+        start = time.perf_counter()
+        self._sweep_results()
+        self._sweep_temp()
+        with self._lock:
+            self._metrics["sweeps"] += 1
+            self._metrics["last_sweep_at"] = time.time()
+            self._metrics["last_sweep_seconds"] = round(time.perf_counter() - start, 4)
+        return self.metrics()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                **self._metrics,
+                "files_removed": dict(self._metrics["files_removed"]),
+                "bytes_reclaimed": dict(self._metrics["bytes_reclaimed"]),
+                "tracked_files": len(self._index),
+                "tracked_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def start(self):
+        """Sweep in a background thread every interval_seconds"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="results-sweeper", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                reclaimed_before = sum(self.metrics()["bytes_reclaimed"].values())
+                metrics = self.sweep()
+                reclaimed = sum(metrics["bytes_reclaimed"].values()) - reclaimed_before
+                if reclaimed:
+                    print(
+                        f"🧹 Reclaimed {reclaimed / (1024 * 1024):.1f} MB; "
+                        f"{metrics['tracked_files']} result files "
+                        f"({metrics['tracked_bytes'] / (1024 * 1024):.1f} MB) remain"
+                    )
+            except Exception as e:
+                print(f"⚠️ Results sweep failed: {e}")
+
+
+# Global instance
+results_sweeper = None
+
+def get_results_sweeper(active_paths: Callable[[], Iterable[str]] = None) -> ResultsSweeper:
+    """Get or create the results sweeper instance"""
+    global results_sweeper
+    if results_sweeper is None:
+        results_sweeper = ResultsSweeper(active_paths=active_paths)
+    return results_sweeper
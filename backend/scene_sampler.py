@@ -0,0 +1,208 @@
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+import config
+from frame_sampler import sample_indices, read_frames
+
+UNIFORM = "uniform"
+ADAPTIVE = "adaptive"
+SELECTIONS = (UNIFORM, ADAPTIVE)
+
+HISTOGRAM_BINS = 32
+SIGNATURE_WIDTH = 64
+THUMBNAIL_SIZE = (16, 16)
+
+
+def luma_histogram(gray: np.ndarray) -> np.ndarray:
+    """L1-normalized luma histogram of a grayscale image"""
+    hist = cv2.calcHist([gray], [0], None, [HISTOGRAM_BINS], [0, 256]).flatten()
+    return hist / max(float(hist.sum()), 1.0)
+
+
+def frame_signature(frame: np.ndarray) -> np.ndarray:
+    """Cheap content signature of a BGR frame
+
+    The luma histogram of a small copy catches changes in tone (cuts), and a
+    16x16 luma thumbnail catches motion and layout changes the histogram is
+    blind to.
+    """
+    scale = SIGNATURE_WIDTH / frame.shape[1]
+    small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else frame
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    thumbnail = cv2.resize(gray, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA).flatten() / 255.0
+    return np.concatenate([luma_histogram(gray), thumbnail]).astype(np.float32)
+
+
+def signature_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distance between signatures in [0, 1]; broadcasts over leading axes
+
+    The larger of the histograms' total variation distance and the mean
+    absolute thumbnail difference.
+    """
+    difference = np.abs(a - b)
+    return np.maximum(
+        difference[..., :HISTOGRAM_BINS].sum(axis=-1) / 2,
+        difference[..., HISTOGRAM_BINS:].mean(axis=-1)
+    )
+
+
+def shot_starts(signatures: np.ndarray, cut_threshold: float) -> List[int]:
+    """Positions where a new shot starts (always including 0)"""
+    if len(signatures) == 0:
+        return []
+    jumps = signature_distance(signatures[1:], signatures[:-1])
+    return [0] + (np.flatnonzero(jumps > cut_threshold) + 1).tolist()
+
+
+def _farthest_points(signatures: np.ndarray, first: int, count: int, min_distance: float,
+                     chosen: List[int] = None) -> List[int]:
+    """Greedily add up to `count` positions, each as far as possible from those already chosen
+
+    Stops early when the best remaining candidate is within min_distance of
+    the chosen set, i.e. only near-duplicates are left. Ties go to the
+    earliest position, so the result is deterministic.
+    """
+    chosen = list(chosen or [])
+    if not chosen and count > 0:
+        chosen.append(first)
+        count -= 1
+    if count <= 0 or not chosen:
+        return chosen
+
+    nearest = np.min(signature_distance(signatures[:, None, :], signatures[chosen][None, :, :]), axis=1)
+    nearest[chosen] = -np.inf
+    for _ in range(count):
+        best = int(np.argmax(nearest))
+        if nearest[best] <= min_distance:
+            break
+        chosen.append(best)
+        nearest = np.minimum(nearest, signature_distance(signatures, signatures[best]))
+        nearest[best] = -np.inf
+    return chosen
+
+
+def allocate(shot_lengths: List[int], budget: int) -> List[int]:
+    """Split the budget across shots in proportion to their length, at least one per shot
+
+    Uses the largest-remainder method; the caller makes sure there are no
+    more shots than budget.
+    """
+    quotas = [1] * len(shot_lengths)
+    remaining = budget - len(shot_lengths)
+    if remaining <= 0:
+        return quotas
+
+    total = sum(shot_lengths)
+    shares = [remaining * length / total for length in shot_lengths]
+    for i, share in enumerate(shares):
+        quotas[i] += int(share)
+    leftover = budget - sum(quotas)
+    by_remainder = sorted(range(len(shares)), key=lambda i: (-(shares[i] - int(shares[i])), i))
+    for i in by_remainder[:leftover]:
+        quotas[i] += 1
+    return quotas
+
+
+def select_positions(signatures: np.ndarray, budget: int, cut_threshold: float = None,
+                     dedup_threshold: float = None) -> List[int]:
+    """Pick up to `budget` candidate positions covering every shot, skipping near-duplicates
+
+    Each shot gets a share of the budget proportional to its length (at
+    least one sample). Within a shot, frames are picked farthest-first from
+    the shot's middle frame, and picking stops once only frames within
+    dedup_threshold of an already chosen one are left; the unused budget
+    goes to shots that still have distinct frames. When there are more
+    shots than budget, the most distinct shots are kept, longest first.
+    Fewer than `budget` positions are returned only when the remaining
+    frames are all near-duplicates.
+    """
+    if cut_threshold is None:
+        cut_threshold = config.SCENE_CUT_THRESHOLD
+    if dedup_threshold is None:
+        dedup_threshold = config.SCENE_DEDUP_THRESHOLD
+    if budget <= 0 or len(signatures) == 0:
+        return []
+
+    starts = shot_starts(signatures, cut_threshold)
+    shots = [(start, end) for start, end in zip(starts, starts[1:] + [len(signatures)])]
+    middles = [(start + end - 1) // 2 for start, end in shots]
+
+    if len(shots) > budget:
+        longest = max(range(len(shots)), key=lambda i: (shots[i][1] - shots[i][0], -i))
+        kept = _farthest_points(signatures[middles], longest, budget, -1.0)
+        return sorted(middles[i] for i in kept)
+
+    quotas = allocate([end - start for start, end in shots], budget)
+    chosen = []
+    for (start, end), middle, quota in zip(shots, middles, quotas):
+        picks = _farthest_points(signatures[start:end], middle - start, quota, dedup_threshold)
+        chosen.append([start + pick for pick in picks])
+
+    # Hand budget left over by near-static shots to the longest shots that still have distinct frames
+    leftover = budget - sum(len(picks) for picks in chosen)
+    order = sorted(range(len(shots)), key=lambda i: (-(shots[i][1] - shots[i][0]), i))
+    while leftover > 0:
+        progressed = False
+        for i in order:
+            if leftover == 0:
+                break
+            start, end = shots[i]
+            picks = _farthest_points(
+                signatures[start:end], 0, 1, dedup_threshold, [p - start for p in chosen[i]]
+            )
+            if len(picks) > len(chosen[i]):
+                chosen[i].append(start + picks[-1])
+                leftover -= 1
+                progressed = True
+        if not progressed:
+            break
+
+    return sorted(position for picks in chosen for position in picks)
+
+
+def adaptive_frames(cap: cv2.VideoCapture, budget: int, max_candidates: int = None,
+                    max_kept_bytes: int = None, **thresholds) -> List[Tuple[int, np.ndarray]]:
+    """(frame index, BGR frame) for frames chosen by content rather than evenly spaced
+
+    One streaming pass over the freshly opened capture computes signatures
+    for up to max_candidates evenly spaced candidate frames (using the
+    regular decode strategy), then select_positions allocates the budget
+    across the shots found. The candidate frames are kept while they fit in
+    max_kept_bytes, so the chosen ones are returned without decoding them
+    again; for larger videos only the chosen frames are re-read from the
+    same capture. Deterministic for a given video and settings.
+    """
+    if max_candidates is None:
+        max_candidates = config.SCENE_SAMPLER_CANDIDATES
+    if max_kept_bytes is None:
+        max_kept_bytes = config.SCENE_SAMPLER_KEEP_BYTES
+
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if total_frames == 0:
+        return []
+    candidates = sample_indices(total_frames, max(max_candidates, budget))
+
+    indices = []
+    signatures = []
+    frames = []
+    kept_bytes = 0
+    for idx, frame in read_frames(cap, candidates):
+        indices.append(idx)
+        signatures.append(frame_signature(frame))
+        if frames is not None:
+            kept_bytes += frame.nbytes
+            if kept_bytes <= max_kept_bytes:
+                frames.append(frame)
+            else:
+                frames = None
+
+    if not indices:
+        return []
+    positions = select_positions(np.stack(signatures), budget, **thresholds)
+    if frames is not None:
+        return [(indices[position], frames[position]) for position in positions]
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    return list(read_frames(cap, [indices[position] for position in positions]))
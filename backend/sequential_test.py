@@ -0,0 +1,84 @@
+import math
+from typing import List, Optional
+
+import config
+
+FAKE = "FAKE"
+REAL = "REAL"
+
+
+def progressive_order(count: int) -> List[int]:
+    """Order positions 0..count-1 coarse to fine: the middle first, then halves, quarters, ...
+
+    Every prefix is spread across the whole video, so a verdict reached
+    after a few frames is not based on one stretch of it.
+    """
+    order = []
+    intervals = [(0, count - 1)]
+    while intervals:
+        next_intervals = []
+        for low, high in intervals:
+            if low > high:
+                continue
+            middle = (low + high) // 2
+            order.append(middle)
+            next_intervals.extend([(low, middle - 1), (middle + 1, high)])
+        intervals = next_intervals
+    return order
+
+
+class SequentialTest:
+    """Wald's sequential probability ratio test on per-frame fake probabilities
+
+    Each frame adds its log-odds log(p_fake / p_real), clipped to
+    ±max_frame_log_odds because frames of one video are far from independent
+    and a single overconfident frame must not decide alone. The test
+    accepts FAKE once the sum reaches log((1 - beta) / alpha) and REAL once
+    it falls to log(beta / (1 - alpha)), but never before min_frames frames.
+    alpha and beta are the tolerated false-FAKE and false-REAL rates.
+    """
+
+    def __init__(
+        self,
+        alpha: float = None,
+        beta: float = None,
+        min_frames: int = None,
+        max_frame_log_odds: float = None
+    ):
+        alpha = config.EARLY_EXIT_ALPHA if alpha is None else alpha
+        beta = config.EARLY_EXIT_BETA if beta is None else beta
+        self.min_frames = config.EARLY_EXIT_MIN_FRAMES if min_frames is None else min_frames
+        self.max_frame_log_odds = (
+            config.EARLY_EXIT_MAX_FRAME_LOG_ODDS if max_frame_log_odds is None else max_frame_log_odds
+        )
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+
+        self.log_odds = 0.0
+        self.frames = 0
+        self.decision: Optional[str] = None
+
+    def update(self, fake_probability: float) -> Optional[str]:
+        """Add one frame's fake probability (0-1); returns FAKE or REAL once decided"""
+        if self.decision is not None:
+            return self.decision
+
+        p = min(max(fake_probability, 1e-6), 1 - 1e-6)
+        frame_log_odds = math.log(p / (1 - p))
+        self.log_odds += max(-self.max_frame_log_odds, min(self.max_frame_log_odds, frame_log_odds))
+        self.frames += 1
+
+        if self.frames >= self.min_frames:
+            if self.log_odds >= self.upper:
+                self.decision = FAKE
+            elif self.log_odds <= self.lower:
+                self.decision = REAL
+        return self.decision
+
+    def summary(self) -> dict:
+        return {
+            "decided": self.decision is not None,
+            "decision": self.decision,
+            "log_odds": round(self.log_odds, 4),
+            "bounds": [round(self.lower, 4), round(self.upper, 4)],
+        }
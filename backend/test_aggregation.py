@@ -0,0 +1,85 @@
+"""
+Unit tests for video verdict aggregation
+Run with: python -m pytest test_aggregation.py
+"""
+
+import pytest
+import torch
+
+from aggregation import (
+    aggregate, ema_curve, ema_score, timeline, top_k_score, trimmed_mean_score, FAKE_CLASS
+)
+
+
+def fake_probabilities(*values) -> torch.Tensor:
+    return torch.tensor(values, dtype=torch.float64)
+
+
+def test_trimmed_mean_single_frame():
+    assert trimmed_mean_score(fake_probabilities(0.7), trim=0.4).item() == pytest.approx(0.7)
+
+
+def test_trimmed_mean_drops_both_ends():
+    scores = fake_probabilities(0.0, 0.1, 0.5, 0.9, 1.0)
+    assert trimmed_mean_score(scores, trim=0.2).item() == pytest.approx(0.5)
+
+
+def test_trimmed_mean_keeps_at_least_the_middle():
+    # A trim of one half would drop everything; the middle frames are kept
+    assert trimmed_mean_score(fake_probabilities(0.1, 0.4, 0.6, 0.9), trim=0.5).item() == pytest.approx(0.5)
+    assert trimmed_mean_score(fake_probabilities(0.1, 0.3, 0.9), trim=0.5).item() == pytest.approx(0.3)
+
+
+def test_top_k_single_frame():
+    assert top_k_score(fake_probabilities(0.3), k=3).item() == pytest.approx(0.3)
+
+
+def test_top_k_larger_than_frame_count_uses_every_frame():
+    assert top_k_score(fake_probabilities(0.2, 0.4, 0.9), k=10).item() == pytest.approx(0.5)
+
+
+def test_top_k_averages_the_most_suspicious_frames():
+    assert top_k_score(fake_probabilities(0.1, 0.8, 0.2, 1.0), k=2).item() == pytest.approx(0.9)
+    assert top_k_score(fake_probabilities(0.1, 0.8), k=0).item() == pytest.approx(0.8)
+
+
+@pytest.mark.parametrize("alpha", [0.1, 0.5, 0.9, 1.0])
+def test_ema_curve_matches_recursive_definition(alpha):
+    scores = torch.rand(20, generator=torch.Generator().manual_seed(0), dtype=torch.float64)
+    expected = [scores[0].item()]
+    for p in scores[1:].tolist():
+        expected.append(alpha * p + (1 - alpha) * expected[-1])
+    assert torch.allclose(ema_curve(scores, alpha), torch.tensor(expected, dtype=torch.float64))
+
+
+def test_ema_curve_single_frame():
+    assert ema_curve(fake_probabilities(0.6), 0.3).tolist() == pytest.approx([0.6])
+
+
+def test_ema_score_ignores_a_single_spike():
+    scores = fake_probabilities(0.1, 0.1, 1.0, 0.1, 0.1)
+    assert ema_score(scores, 0.3).item() < 0.5
+    assert top_k_score(scores, k=1).item() == pytest.approx(1.0)
+
+
+def test_timeline_bins_frames_by_second():
+    scores = fake_probabilities(0.2, 0.4, 0.9, 0.6)
+    assert timeline(scores, [0.2, 0.8, 1.5, 3.9]) == [
+        {"second": 0, "fake_probability": 0.3, "max_fake_probability": 0.4, "frames": 2},
+        {"second": 1, "fake_probability": 0.9, "max_fake_probability": 0.9, "frames": 1},
+        {"second": 3, "fake_probability": 0.6, "max_fake_probability": 0.6, "frames": 1},
+    ]
+
+
+def test_aggregate_reads_the_fake_column():
+    probabilities = torch.zeros(3, 2)
+    probabilities[:, FAKE_CLASS] = torch.tensor([0.9, 0.8, 0.95])
+    probabilities[:, 1 - FAKE_CLASS] = 1 - probabilities[:, FAKE_CLASS]
+    result = aggregate(probabilities, [0.0, 1.0, 2.0], method="trimmed_mean")
+    assert result["verdict"] == "FAKE"
+    assert len(result["timeline"]) == 3
+
+
+def test_aggregate_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        aggregate(torch.full((1, 2), 0.5), [0.0], method="median")
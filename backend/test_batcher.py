@@ -0,0 +1,118 @@
+"""
+Unit tests for the micro-batcher
+Run with: python -m pytest test_batcher.py
+"""
+
+import threading
+
+import pytest
+import torch
+import torch.nn as nn
+
+from batcher import MicroBatcher
+
+
+class CountingModel(nn.Module):
+    """Small eval-mode classifier that records the batch size of every forward pass"""
+
+    def __init__(self):
+        super().__init__()
+        torch.manual_seed(0)
+        self.features = nn.Sequential(
+            nn.Conv2d(3, 8, 3, padding=1),
+            nn.BatchNorm2d(8),
+            nn.ReLU(),
+            nn.AdaptiveAvgPool2d(1),
+            nn.Flatten()
+        )
+        self.head = nn.Linear(8, 2)
+        self.batch_sizes = []
+        self.eval()
+
+    def forward(self, inputs):
+        self.batch_sizes.append(inputs.shape[0])
+        return self.head(self.features(inputs))
+
+
+class FailingModel(nn.Module):
+    def forward(self, inputs):
+        raise RuntimeError("forward failed")
+
+
+def unbatched_probabilities(model: nn.Module, image_tensor: torch.Tensor) -> torch.Tensor:
+    """What DeepfakeDetector.predict computes without the batcher"""
+    with torch.no_grad():
+        return torch.nn.functional.softmax(model(image_tensor), dim=1)
+
+
+@pytest.fixture
+def inputs():
+    generator = torch.Generator().manual_seed(1)
+    # Single images ([C, H, W]) and small stacks ([N, C, H, W]) mixed in one batch
+    return [
+        torch.randn(3, 32, 32, generator=generator),
+        torch.randn(2, 3, 32, 32, generator=generator),
+        torch.randn(1, 3, 32, 32, generator=generator),
+        torch.randn(3, 32, 32, generator=generator),
+    ]
+
+
+def test_batched_output_matches_single_item_calls(inputs):
+    model = CountingModel()
+    expected = [unbatched_probabilities(model, tensor if tensor.dim() == 4 else tensor.unsqueeze(0)) for tensor in inputs]
+    model.batch_sizes.clear()
+
+    # A long wait makes sure every submission lands in the same batch
+    batcher = MicroBatcher(model, "cpu", max_batch_size=16, max_wait_ms=500)
+    try:
+        futures = [batcher.submit(tensor) for tensor in inputs]
+        results = [future.result(timeout=5) for future in futures]
+    finally:
+        batcher.close()
+
+    assert model.batch_sizes == [5]
+    for result, single in zip(results, expected):
+        assert result.shape == single.shape
+        assert torch.allclose(result, single, atol=1e-5)
+
+
+def test_concurrent_predict_matches_single_item_calls(inputs):
+    model = CountingModel()
+    singles = [tensor if tensor.dim() == 4 else tensor.unsqueeze(0) for tensor in inputs]
+    expected = [unbatched_probabilities(model, tensor) for tensor in singles]
+
+    batcher = MicroBatcher(model, "cpu", max_batch_size=3, max_wait_ms=50)
+    results = [None] * len(singles)
+
+    def predict(i):
+        results[i] = batcher.predict(singles[i])
+
+    threads = [threading.Thread(target=predict, args=(i,)) for i in range(len(singles))]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+    finally:
+        batcher.close()
+
+    for result, single in zip(results, expected):
+        assert torch.allclose(result, single, atol=1e-5)
+
+
+def test_errors_reach_every_waiting_caller(inputs):
+    batcher = MicroBatcher(FailingModel(), "cpu", max_batch_size=16, max_wait_ms=500)
+    try:
+        futures = [batcher.submit(tensor) for tensor in inputs]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="forward failed"):
+                future.result(timeout=5)
+    finally:
+        batcher.close()
+
+
+def test_submit_after_close_fails(inputs):
+    batcher = MicroBatcher(CountingModel(), "cpu")
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit(inputs[0])
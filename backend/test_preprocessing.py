@@ -0,0 +1,72 @@
+"""
+Unit tests for the vectorized preprocessing
+Run with: python -m pytest test_preprocessing.py
+"""
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+from torchvision import transforms
+
+import config
+from preprocessing import Preprocessor
+
+
+def reference_transform():
+    """The torchvision chain the Preprocessor replaces"""
+    return transforms.Compose([
+        transforms.Resize(config.IMAGE_SIZE),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=config.MEAN, std=config.STD)
+    ])
+
+
+def fixed_image(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """Smooth colour gradients plus a little noise, so resampling differences stay small"""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, width)[None, :, None]
+    y = np.linspace(0, 1, height)[:, None, None]
+    channels = np.concatenate([x * np.ones_like(y), y * np.ones_like(x), (x + y) / 2], axis=2)
+    noise = rng.normal(0, 0.002, channels.shape)
+    return (np.clip(channels + noise, 0, 1) * 255).astype(np.uint8)
+
+
+def reference(images) -> torch.Tensor:
+    transform = reference_transform()
+    return torch.stack([transform(Image.fromarray(image)) for image in images])
+
+
+def test_matches_torchvision_at_model_size():
+    width, height = config.IMAGE_SIZE
+    images = [fixed_image(width, height, seed) for seed in range(4)]
+    actual = Preprocessor()(images)
+    assert actual.shape == (4, 3, height, width)
+    assert actual.dtype == torch.float32
+    assert torch.allclose(actual, reference(images), atol=1e-6)
+
+
+def test_close_to_torchvision_after_resize():
+    # cv2's bilinear resize is not antialiased like PIL's, so only approximate agreement is expected
+    images = [fixed_image(320, 240)]
+    difference = (Preprocessor()(images) - reference(images)).abs()
+    assert difference.mean().item() < 0.05
+    assert difference.max().item() < 0.25
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_batch_rows_match_single_calls(count):
+    preprocessor = Preprocessor()
+    width, height = config.IMAGE_SIZE
+    images = [fixed_image(width, height, seed) for seed in range(count)]
+    batch = preprocessor(images)
+    for i, image in enumerate(images):
+        assert torch.equal(batch[i], preprocessor(image)[0])
+
+
+def test_reused_staging_buffer_does_not_leak_between_calls():
+    preprocessor = Preprocessor()
+    width, height = config.IMAGE_SIZE
+    first, second = fixed_image(width, height, 1), fixed_image(width, height, 2)
+    preprocessor([first, second])
+    assert torch.equal(preprocessor(second), Preprocessor()(second))
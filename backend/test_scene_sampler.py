@@ -0,0 +1,88 @@
+"""
+Unit tests for scene-aware frame selection
+Run with: python -m pytest test_scene_sampler.py
+"""
+
+import bisect
+
+import numpy as np
+
+from scene_sampler import allocate, select_positions, shot_starts, HISTOGRAM_BINS, THUMBNAIL_SIZE
+
+CUT_THRESHOLD = 0.35
+DEDUP_THRESHOLD = 0.02
+
+
+def shot_signatures(lengths, distinct=True) -> np.ndarray:
+    """Signatures of consecutive shots: each shot fills its own histogram bin
+
+    With distinct=True the thumbnail brightens by 0.01 per frame, so frames
+    within a shot differ a little; otherwise they are exact duplicates.
+    """
+    rows = []
+    for shot, length in enumerate(lengths):
+        for frame in range(length):
+            histogram = np.zeros(HISTOGRAM_BINS, dtype=np.float32)
+            histogram[shot] = 1
+            thumbnail = np.full(THUMBNAIL_SIZE[0] * THUMBNAIL_SIZE[1], frame / 100 if distinct else 0, dtype=np.float32)
+            rows.append(np.concatenate([histogram, thumbnail]))
+    return np.stack(rows)
+
+
+def shots_of(positions, lengths) -> set:
+    starts = np.cumsum([0] + list(lengths[:-1])).tolist()
+    return {bisect.bisect_right(starts, position) - 1 for position in positions}
+
+
+def test_shot_starts():
+    assert shot_starts(shot_signatures([3, 5, 2]), CUT_THRESHOLD) == [0, 3, 8]
+    assert shot_starts(np.zeros((0, HISTOGRAM_BINS)), CUT_THRESHOLD) == []
+
+
+def test_allocate_is_proportional_with_one_per_shot():
+    assert allocate([3, 20, 2], 6) == [1, 4, 1]
+    assert allocate([10, 10], 4) == [2, 2]
+
+
+def test_allocate_breaks_remainder_ties_by_position():
+    assert allocate([30, 10], 4) == [3, 1]
+
+
+def test_allocate_spends_the_whole_budget():
+    for lengths, budget in [([7, 3, 1], 10), ([1, 1, 1, 97], 5), ([5], 1)]:
+        assert sum(allocate(lengths, budget)) == budget
+
+
+def test_allocate_more_shots_than_budget_gives_one_each():
+    assert allocate([5, 5, 5], 2) == [1, 1, 1]
+
+
+def test_select_positions_covers_every_shot():
+    lengths = [3, 20, 2]
+    positions = select_positions(shot_signatures(lengths), 6, CUT_THRESHOLD, DEDUP_THRESHOLD)
+    assert len(positions) == 6
+    assert positions == sorted(set(positions))
+    assert shots_of(positions, lengths) == {0, 1, 2}
+
+
+def test_select_positions_more_shots_than_budget():
+    lengths = [2, 8, 3, 1, 6]
+    positions = select_positions(shot_signatures(lengths), 3, CUT_THRESHOLD, DEDUP_THRESHOLD)
+    # The longest shot is kept first, then ties go to the earliest shots; each by its middle frame
+    assert positions == [0, 5, 11]
+    assert len(shots_of(positions, lengths)) == 3
+
+
+def test_select_positions_skips_duplicates():
+    positions = select_positions(shot_signatures([10], distinct=False), 4, CUT_THRESHOLD, DEDUP_THRESHOLD)
+    assert positions == [4]
+
+
+def test_select_positions_is_deterministic():
+    signatures = shot_signatures([4, 12, 7, 1])
+    first = select_positions(signatures, 8, CUT_THRESHOLD, DEDUP_THRESHOLD)
+    assert select_positions(signatures, 8, CUT_THRESHOLD, DEDUP_THRESHOLD) == first
+
+
+def test_select_positions_empty():
+    assert select_positions(shot_signatures([5]), 0, CUT_THRESHOLD, DEDUP_THRESHOLD) == []
@@ -0,0 +1,87 @@
+"""
+Unit tests for the early-exit sequential test
+Run with: python -m pytest test_sequential_test.py
+"""
+
+import math
+
+import pytest
+
+from sequential_test import SequentialTest, progressive_order, FAKE, REAL
+
+
+def test_bounds_follow_alpha_and_beta():
+    test = SequentialTest(alpha=0.05, beta=0.1, min_frames=1, max_frame_log_odds=10)
+    assert test.upper == pytest.approx(math.log(0.9 / 0.05))
+    assert test.lower == pytest.approx(math.log(0.1 / 0.95))
+
+
+def test_decides_fake_once_upper_bound_is_reached():
+    test = SequentialTest(alpha=0.05, beta=0.05, min_frames=1, max_frame_log_odds=10)
+    # One frame at 0.9 adds log(9) ~ 2.2, short of log(0.95 / 0.05) ~ 2.94
+    assert test.update(0.9) is None
+    assert test.update(0.9) == FAKE
+    assert test.frames == 2
+
+
+def test_decides_real_once_lower_bound_is_reached():
+    test = SequentialTest(alpha=0.05, beta=0.05, min_frames=1, max_frame_log_odds=10)
+    assert test.update(0.1) is None
+    assert test.update(0.1) == REAL
+
+
+def test_min_frames_delays_the_decision():
+    test = SequentialTest(alpha=0.05, beta=0.05, min_frames=3, max_frame_log_odds=10)
+    assert test.update(0.999) is None
+    assert test.update(0.999) is None
+    assert test.log_odds > test.upper
+    assert test.update(0.5) == FAKE
+
+
+def test_frame_log_odds_are_clipped():
+    test = SequentialTest(alpha=0.05, beta=0.05, min_frames=1, max_frame_log_odds=1.5)
+    test.update(1.0)
+    assert test.log_odds == pytest.approx(1.5)
+    test.update(0.0)
+    assert test.log_odds == pytest.approx(0.0)
+
+
+def test_one_overconfident_frame_cannot_decide_alone():
+    test = SequentialTest(alpha=0.05, beta=0.05, min_frames=1, max_frame_log_odds=1.5)
+    # Each frame adds at most 1.5, so reaching log(0.95 / 0.05) ~ 2.94 takes two
+    assert test.update(1.0) is None
+    assert test.update(1.0) == FAKE
+
+
+def test_decision_is_sticky():
+    test = SequentialTest(alpha=0.05, beta=0.05, min_frames=1, max_frame_log_odds=10)
+    test.update(0.999)
+    assert test.decision == FAKE
+    assert test.update(0.001) == FAKE
+    assert test.frames == 1
+
+
+def test_summary():
+    test = SequentialTest(alpha=0.05, beta=0.05, min_frames=2, max_frame_log_odds=1.5)
+    test.update(0.9)
+    summary = test.summary()
+    assert summary["decided"] is False
+    assert summary["decision"] is None
+    assert summary["bounds"] == [round(test.lower, 4), round(test.upper, 4)]
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 7, 16, 100])
+def test_progressive_order_is_a_permutation(count):
+    assert sorted(progressive_order(count)) == list(range(count))
+
+
+def test_progressive_order_goes_coarse_to_fine():
+    assert progressive_order(7) == [3, 1, 5, 0, 2, 4, 6]
+    assert progressive_order(1) == [0]
+    assert progressive_order(0) == []
+
+
+def test_progressive_order_prefixes_span_the_video():
+    order = progressive_order(100)
+    first = sorted(order[:3])
+    assert first[0] < 34 and first[-1] > 66
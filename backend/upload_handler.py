@@ -0,0 +1,140 @@
+import hashlib
+from pathlib import Path
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+import config
+from metrics import stage_timer
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit")
+
+
+class UploadLimitMiddleware:
+    """ASGI middleware that caps request bodies per path while they stream in
+
+    Requests whose Content-Length is over the limit are rejected before the
+    body is read. Otherwise the body bytes are counted as the app receives
+    them, and the request fails with 413 as soon as the count passes the
+    limit, so a chunked upload without Content-Length is never spooled to
+    disk in full. `overhead_bytes` allows for the multipart framing around
+    the file.
+    """
+
+    def __init__(self, app, limits: dict, overhead_bytes: int = 0):
+        self.app = app
+        self.limits = limits
+        self.overhead_bytes = overhead_bytes
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if not max_bytes:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = max_bytes + self.overhead_bytes
+        detail = str(UploadTooLargeError(max_bytes))
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > allowed:
+            await JSONResponse(status_code=413, content={"detail": detail})(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > allowed:
+                    # An HTTPException passes through FastAPI's body parsing as is
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            await JSONResponse(status_code=413, content={"detail": e.detail})(scope, receive, send)
+
+
+async def save_upload(
+    file: UploadFile,
+    dest: Path,
+    max_bytes: int,
+    chunk_size: int = None
+) -> dict:
+    """Stream an upload to disk in chunks, enforcing the size limit and hashing as it goes
+
+    Returns a dict with the destination path, size in bytes and SHA-256 hex
+    digest. The partially written file is removed if the limit is exceeded
+    or the write fails.
+    """
+    chunk_size = chunk_size or config.UPLOAD_CHUNK_SIZE
+    dest = Path(dest)
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        with stage_timer("upload_write"):
+            async with aiofiles.open(dest, 'wb') as f:
+                while True:
+                    chunk = await file.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadTooLargeError(max_bytes)
+                    hasher.update(chunk)
+                    await f.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+
+    return {
+        "path": dest,
+        "size": size,
+        "sha256": hasher.hexdigest()
+    }
+
+
+async def read_upload(file: UploadFile, max_bytes: int, chunk_size: int = None) -> dict:
+    """Read an upload into memory in chunks, enforcing the size limit and hashing as it goes
+
+    Only meant for small payloads such as images; videos go through save_upload.
+    Returns a dict with the bytes, size in bytes and SHA-256 hex digest.
+    """
+    chunk_size = chunk_size or config.UPLOAD_CHUNK_SIZE
+    hasher = hashlib.sha256()
+    data = bytearray()
+
+    with stage_timer("upload_read"):
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            if len(data) + len(chunk) > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            hasher.update(chunk)
+            data.extend(chunk)
+
+    return {
+        "data": memoryview(data),
+        "size": len(data),
+        "sha256": hasher.hexdigest()
+    }
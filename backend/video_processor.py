@@ -2,89 +2,135 @@ import cv2
 import numpy as np
 from pathlib import Path
 import torch
-from torchvision import transforms
 import config
-from typing import List, Dict, Optional
+from frame_sampler import sample_indices, read_frames
+from scene_sampler import adaptive_frames, ADAPTIVE
+from preprocessing import Preprocessor
+from blob_store import BlobStore, get_blob_store
+from metrics import stage_timer, ERRORS
+from face_tracker import FaceTracker
+from aggregation import aggregate
+from sequential_test import SequentialTest, progressive_order, FAKE
+from detector_pool import DetectorPool
+from typing import Callable, Iterator, List, Dict, Optional
 import base64
 from io import BytesIO
-from PIL import Image
 
 class VideoProcessor:
-    def __init__(self):
-        # Initialize MediaPipe face detector with error handling
-        self.face_detector = None
+    def __init__(self, blob_store: BlobStore = None):
+        # Frame thumbnails are stored once and served by URL
+        self.blob_store = blob_store or get_blob_store()
+        
+        # Initialize MediaPipe face detection with error handling
+        self.detector_pool = None
         self.mp_face = None
         
         try:
             import mediapipe as mp
             self.mp_face = mp.solutions.face_detection
-            self.face_detector = self.mp_face.FaceDetection(
-                model_selection=1,
-                min_detection_confidence=0.5
+            # MediaPipe graphs are not safe to call from several threads at
+            # once, so each worker checks out its own detector from a pool;
+            # the first one is created now to verify MediaPipe works
+            self.detector_pool = DetectorPool(
+                self.create_face_detector,
+                initial=[self.create_face_detector()]
             )
             print("✅ MediaPipe face detection initialized successfully")
         except (AttributeError, ImportError) as e:
             print(f"⚠️ MediaPipe initialization failed: {e}")
             print("⚠️ Video processing will work without face detection (using center crop)")
         
-        self.transform = transforms.Compose([
-            transforms.Resize(config.IMAGE_SIZE),
-            transforms.ToTensor(),
-            transforms.Normalize(mean=config.MEAN, std=config.STD)
-        ])
+        self.preprocessor = Preprocessor()
+    
+    def create_face_detector(self):
+        return self.mp_face.FaceDetection(
+            model_selection=1,
+            min_detection_confidence=0.5
+        )
+    
+    @property
+    def face_detection_available(self) -> bool:
+        return self.detector_pool is not None
+    
+    def close(self):
+        """Release the MediaPipe detectors"""
+        if self.detector_pool is not None:
+            self.detector_pool.close()
     
-    def sample_frames(self, video_path: str, num_frames: int = None) -> tuple[List[np.ndarray], List[float]]:
-        """Extract evenly spaced frames from video"""
+    def iter_sampled_frames(self, video_path: str, num_frames: int = None,
+                            selection: str = None) -> Iterator[tuple[np.ndarray, float]]:
+        """Yield (RGB frame, timestamp) for the sampled frames, one at a time
+        
+        Frames are evenly spaced, or with selection="adaptive" (see
+        FRAME_SELECTION) spread across the video's shots by scene_sampler.
+        """
         if num_frames is None:
             num_frames = config.VIDEO_SAMPLE_FRAMES
+        if selection is None:
+            selection = config.FRAME_SELECTION
             
         cap = cv2.VideoCapture(video_path)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        
-        if total_frames == 0:
-            cap.release()
-            return [], []
-        
-        # Sample frame indices
-        frame_indices = np.linspace(0, total_frames - 1, num_frames, dtype=int) \
-            if total_frames > num_frames else range(total_frames)
-        
-        frames = []
-        timestamps = []
-        
-        for idx in frame_indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-            ret, frame = cap.read()
-            if ret:
+        try:
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            
+            if total_frames == 0:
+                return
+            
+            # Sample frame indices; adaptive selection decodes the chosen
+            # frames during its scene analysis pass
+            if selection == ADAPTIVE and total_frames > num_frames:
+                with stage_timer("scene_analysis"):
+                    sampled = adaptive_frames(cap, num_frames)
+            else:
+                sampled = read_frames(cap, sample_indices(total_frames, num_frames))
+            
+            for idx, frame in sampled:
                 # Convert BGR to RGB
                 frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frames.append(frame_rgb)
                 # Calculate timestamp
                 timestamp = idx / fps if fps > 0 else 0
-                timestamps.append(timestamp)
+                yield frame_rgb, timestamp
+        finally:
+            cap.release()
+    
+    def sample_frames(self, video_path: str, num_frames: int = None,
+                      selection: str = None) -> tuple[List[np.ndarray], List[float]]:
+        """Extract sampled frames from video"""
+        frames = []
+        timestamps = []
+        
+        for frame_rgb, timestamp in self.iter_sampled_frames(video_path, num_frames, selection):
+            frames.append(frame_rgb)
+            timestamps.append(timestamp)
         
-        cap.release()
         return frames, timestamps
     
-    def extract_face_mediapipe(self, image: np.ndarray) -> Optional[np.ndarray]:
-        """Extract and crop face from image using MediaPipe"""
-        if self.face_detector is None:
-            return None
-            
+    def detect_face_boxes(self, image: np.ndarray) -> List[Dict]:
+        """Run MediaPipe once and return every detection as {"bbox": [x1, y1, x2, y2], "score"}
+        
+        Boxes are in pixels, clipped to the image, in MediaPipe's order.
+        """
+        if self.detector_pool is None:
+            return []
+        
         try:
             # Process with MediaPipe (expects RGB)
-            results = self.face_detector.process(image)
-            
-            if not results.detections:
-                return None
-            
-            # Get first detection
-            detection = results.detections[0]
+            with self.detector_pool.acquire() as face_detector, stage_timer("face_detection"):
+                results = face_detector.process(image)
+        except Exception as e:
+            print(f"⚠️ MediaPipe face extraction failed: {e}")
+            ERRORS.inc(stage="face_detection")
+            return []
+        
+        if not results.detections:
+            return []
+        
+        h, w, _ = image.shape
+        boxes = []
+        for detection in results.detections:
             bbox = detection.location_data.relative_bounding_box
             
-            h, w, _ = image.shape
-            
             # Convert relative coordinates to absolute
             x1 = int(bbox.xmin * w)
             y1 = int(bbox.ymin * h)
@@ -95,16 +141,64 @@ class VideoProcessor:
             x1, y1 = max(0, x1), max(0, y1)
             x2, y2 = min(w, x2), min(h, y2)
             
-            # Crop face
-            face = image[y1:y2, x1:x2]
-            
-            if face.size == 0:
-                return None
-            
-            return face
-        except Exception as e:
-            print(f"⚠️ MediaPipe face extraction failed: {e}")
+            boxes.append({
+                "bbox": [x1, y1, x2, y2],
+                "score": round(float(detection.score[0]), 4) if detection.score else None
+            })
+        return boxes
+    
+    def extract_face_mediapipe(self, image: np.ndarray) -> Optional[np.ndarray]:
+        """Extract and crop face from image using MediaPipe"""
+        boxes = self.detect_face_boxes(image)
+        if not boxes:
             return None
+        
+        # Get first detection
+        x1, y1, x2, y2 = boxes[0]["bbox"]
+        face = image[y1:y2, x1:x2]
+        
+        if face.size == 0:
+            return None
+        
+        return face
+    
+    def extract_faces(self, image: np.ndarray, min_size: int = None, max_faces: int = None) -> List[Dict]:
+        """Crop every detected face at least min_size px on its shorter side
+        
+        Returns up to max_faces entries of {"bbox", "score", "crop"}, largest
+        first, with crops resized to the model input size. When no face
+        qualifies, the center crop is returned as the only entry with
+        "detected": False so the frame still gets a verdict.
+        """
+        if min_size is None:
+            min_size = config.MULTI_FACE_MIN_SIZE
+        if max_faces is None:
+            max_faces = config.MULTI_FACE_MAX_FACES
+        
+        faces = []
+        for box in self.detect_face_boxes(image):
+            x1, y1, x2, y2 = box["bbox"]
+            if min(x2 - x1, y2 - y1) < max(min_size, 1):
+                continue
+            faces.append({
+                **box,
+                "detected": True,
+                "crop": cv2.resize(image[y1:y2, x1:x2], config.IMAGE_SIZE)
+            })
+        faces.sort(key=lambda face: (face["bbox"][2] - face["bbox"][0]) * (face["bbox"][3] - face["bbox"][1]), reverse=True)
+        faces = faces[:max_faces]
+        
+        if not faces:
+            h, w, _ = image.shape
+            size = min(h, w)
+            y1, x1 = (h - size) // 2, (w - size) // 2
+            faces.append({
+                "bbox": [x1, y1, x1 + size, y1 + size],
+                "score": None,
+                "detected": False,
+                "crop": cv2.resize(self.extract_face_center_crop(image), config.IMAGE_SIZE)
+            })
+        return faces
     
     def extract_face_center_crop(self, image: np.ndarray) -> np.ndarray:
         """Fallback: Extract center crop from image"""
@@ -120,10 +214,37 @@ class VideoProcessor:
         face = image[y1:y2, x1:x2]
         return face
     
-    def extract_face(self, image: np.ndarray) -> np.ndarray:
-        """Extract and crop face from image (with fallback)"""
-        # Try MediaPipe first
-        face = self.extract_face_mediapipe(image)
+    def create_tracker(self) -> Optional[FaceTracker]:
+        """Per-video face tracker, or None when tracking is off or there is no detector"""
+        if not config.FACE_TRACKING_ENABLED or not self.face_detection_available:
+            return None
+        
+        def detect_first(frame: np.ndarray):
+            boxes = self.detect_face_boxes(frame)
+            return boxes[0]["bbox"] if boxes else None
+        
+        return FaceTracker(detect_first)
+    
+    def extract_face_tracked(self, image: np.ndarray, tracker: FaceTracker) -> Optional[np.ndarray]:
+        """Crop the face the tracker follows in this frame"""
+        box = tracker.update(image)
+        if box is None:
+            return None
+        x1, y1, x2, y2 = box
+        face = image[y1:y2, x1:x2]
+        return face if face.size else None
+    
+    def extract_face(self, image: np.ndarray, tracker: FaceTracker = None) -> np.ndarray:
+        """Extract and crop face from image (with fallback)
+        
+        With a tracker (one per video, frames in order), MediaPipe only runs
+        when the tracker needs a fresh detection.
+        """
+        # Try MediaPipe (or the face tracker) first
+        if tracker is not None:
+            face = self.extract_face_tracked(image, tracker)
+        else:
+            face = self.extract_face_mediapipe(image)
         
         # Fallback to center crop if MediaPipe fails or unavailable
         if face is None:
@@ -138,31 +259,238 @@ class VideoProcessor:
         # Extract face
         face = self.extract_face(frame)
         
-        # Convert to PIL Image
-        pil_image = Image.fromarray(face)
-        
-        # Apply transforms
-        tensor = self.transform(pil_image)
-        
-        return tensor
+        # Normalize to a [3, H, W] tensor
+        with stage_timer("preprocessing"):
+            return self.preprocessor(face)[0]
+    
+    def image_to_jpeg(self, image: np.ndarray) -> bytes:
+        """Encode RGB numpy image to JPEG bytes"""
+        # Convert RGB to BGR for cv2
+        with stage_timer("jpeg_encode"):
+            image_bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            _, buffer = cv2.imencode('.jpg', image_bgr)
+            return buffer.tobytes()
     
     def image_to_base64(self, image: np.ndarray) -> str:
         """Convert numpy image to base64 string"""
-        # Convert RGB to BGR for cv2
-        image_bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        jpeg = self.image_to_jpeg(image)
+        with stage_timer("base64_encode"):
+            img_str = base64.b64encode(jpeg).decode('utf-8')
+        return f"data:image/jpeg;base64,{img_str}"
+    
+    def encode_thumbnail(self, image: np.ndarray, inline: bool = False) -> str:
+        """Thumbnail as a blob store URL, or as an inline base64 data URL if requested"""
+        if inline:
+            return self.image_to_base64(image)
+        return self.blob_store.url(self.blob_store.put(self.image_to_jpeg(image)))
+    
+    def frame_verdict(self, pred_class: int, conf_score: float) -> str:
+        """FAKE/REAL verdict for one prediction, UNCERTAIN near the decision boundary"""
+        verdict = "FAKE" if pred_class == 0 else "REAL"
+        if 45 <= conf_score <= 65:
+            verdict = "UNCERTAIN"
+        return verdict
+    
+    def build_frame_result(self, idx: int, timestamp: float, pred_class: int,
+                           conf_score: float, thumbnail: np.ndarray,
+                           inline_thumbnails: bool = False, faces: List[Dict] = None) -> Dict:
+        """Per-frame entry of the video response
         
-        # Encode to JPEG
-        _, buffer = cv2.imencode('.jpg', image_bgr)
+        In multi-face mode `faces` holds the per-face results and the frame's
+        prediction is the worst-case (most likely fake) face.
+        """
+        # Convert timestamp to readable format
+        minutes = int(timestamp // 60)
+        seconds = int(timestamp % 60)
+        time_str = f"{minutes}:{seconds:02d}"
         
-        # Convert to base64
-        img_str = base64.b64encode(buffer).decode('utf-8')
-        return f"data:image/jpeg;base64,{img_str}"
+        result = {
+            "frameNumber": idx + 1,
+            "timestamp": time_str,
+            "verdict": self.frame_verdict(pred_class, conf_score),
+            "confidence": round(conf_score, 2),
+            "thumbnail": self.encode_thumbnail(thumbnail, inline=inline_thumbnails)
+        }
+        if faces is not None:
+            result["faces"] = faces
+        return result
+    
+    def classify_crops(
+        self,
+        crops: List[np.ndarray],
+        model,
+        explainer=None,
+        on_chunk: Optional[Callable[[int, int], None]] = None
+    ) -> tuple[List[np.ndarray], torch.Tensor, torch.Tensor]:
+        """Classify face crops in batches of VIDEO_BATCH_SIZE
+        
+        Returns (thumbnails, probabilities, inputs): Grad-CAM overlays when
+        the explainer succeeds (its forward pass also yields the predictions),
+        otherwise the crops themselves with a plain forward pass; inputs is
+        the preprocessed batch, kept for on-demand explanations.
+        """
+        # Move to CPU (Hugging Face Spaces uses CPU)
+        with stage_timer("preprocessing"):
+            batch = self.preprocessor(crops).cpu()
+        
+        thumbnails = []
+        probabilities = []
+        for start in range(0, len(crops), config.VIDEO_BATCH_SIZE):
+            chunk = batch[start:start + config.VIDEO_BATCH_SIZE]
+            chunk_crops = crops[start:start + config.VIDEO_BATCH_SIZE]
+            
+            chunk_probabilities = None
+            if explainer:
+                try:
+                    chunk_thumbnails, chunk_probabilities = explainer.explain_batch(chunk, chunk_crops)
+                    thumbnails.extend(chunk_thumbnails)
+                except Exception as e:
+                    print(f"⚠️ Error generating heatmaps for crops {start + 1}-{start + len(chunk_crops)}: {e}")
+                    ERRORS.inc(stage="gradcam")
+            
+            if chunk_probabilities is None:
+                with stage_timer("forward"), torch.no_grad():
+                    outputs = model(chunk)
+                    chunk_probabilities = torch.nn.functional.softmax(outputs, dim=1)
+                thumbnails.extend(chunk_crops)
+            
+            probabilities.append(chunk_probabilities)
+            if on_chunk is not None:
+                on_chunk(start + len(chunk_crops), len(crops))
+        
+        return thumbnails, torch.cat(probabilities), batch
     
-    def process_video(self, video_path: str, model, explainer=None) -> Dict:
-        """Process entire video and return frame-by-frame analysis"""
+    def summarize_faces(self, faces: List[Dict], probabilities: torch.Tensor) -> tuple[int, List[Dict]]:
+        """Per-face results for one frame, and the index of its worst-case (most likely fake) face"""
+        confidences, predictions = torch.max(probabilities, 1)
+        results = []
+        for face, pred_class, confidence, fake_probability in zip(
+            faces, predictions.tolist(), (confidences * 100).tolist(), (probabilities[:, 0] * 100).tolist()
+        ):
+            results.append({
+                "bbox": face["bbox"],
+                "detection_score": face["score"],
+                "detected": face["detected"],
+                "verdict": self.frame_verdict(pred_class, confidence),
+                "confidence": round(confidence, 2),
+                "fake_probability": round(fake_probability, 2)
+            })
+        worst = int(torch.argmax(probabilities[:, 0]).item())
+        return worst, results
+    
+    def aggregate_verdict(self, probabilities: torch.Tensor, timestamps: List[float]) -> Dict:
+        """Overall verdict, confidence, explanation and per-second timeline
+        
+        probabilities holds each frame's softmax output (frames x classes);
+        the reduction is chosen with VIDEO_AGGREGATION (see aggregation.py).
+        """
+        return aggregate(probabilities, timestamps)
+    
+    def sequential_verdict(self, test: SequentialTest, fake_probabilities: List[float],
+                           frames_sampled: int) -> Dict:
+        """Overall verdict once the sequential test has decided, before every frame was evaluated"""
+        if test.decision == FAKE:
+            confidence = 100 * sum(fake_probabilities) / len(fake_probabilities)
+            explanation = f"Early exit after {len(fake_probabilities)} of {frames_sampled} frames: accumulated evidence across the video consistently indicates manipulation."
+        else:
+            confidence = 100 * sum(1 - p for p in fake_probabilities) / len(fake_probabilities)
+            explanation = f"Early exit after {len(fake_probabilities)} of {frames_sampled} frames: accumulated evidence across the video consistently indicates authentic content."
+        
+        return {
+            "verdict": test.decision,
+            "confidence": round(confidence, 2),
+            "explanation": explanation
+        }
+    
+    def iter_video(self, video_path: str, model, explainer=None,
+                   inline_thumbnails: bool = False, multi_face: bool = False,
+                   input_sink: Optional[Callable[[int, torch.Tensor], None]] = None) -> Iterator[Dict]:
+        """Analyze a video frame by frame, yielding each result as soon as it is computed
+        
+        Yields {"type": "frame", ...} events followed by one {"type": "result", ...}
+        event with the overall verdict. Only the per-frame class
+        probabilities are kept, so memory stays flat however many frames are
+        sampled. With multi_face, every face in a frame is classified in one
+        batch and the frame takes its worst-case face. input_sink(frame
+        number, input tensor) receives the model input behind each frame's
+        verdict, for explaining it later.
+        """
+        frame_probabilities = []
+        frame_timestamps = []
+        # Tracking follows a single face, so multi-face mode detects every frame
+        tracker = None if multi_face else self.create_tracker()
+        
+        for idx, (frame, timestamp) in enumerate(self.iter_sampled_frames(video_path, config.MAX_FRAMES)):
+            faces = self.extract_faces(frame) if multi_face else [{"crop": self.extract_face(frame, tracker)}]
+            thumbnails, probabilities, inputs = self.classify_crops([face["crop"] for face in faces], model, explainer)
+            
+            face_results = None
+            worst = 0
+            if multi_face:
+                worst, face_results = self.summarize_faces(faces, probabilities)
+            
+            confidence, predicted = torch.max(probabilities[worst], 0)
+            pred_class = predicted.item()
+            conf_score = confidence.item() * 100
+            frame_probabilities.append(probabilities[worst])
+            frame_timestamps.append(timestamp)
+            if input_sink is not None:
+                input_sink(idx + 1, inputs[worst])
+            
+            yield {
+                "type": "frame",
+                **self.build_frame_result(
+                    idx, timestamp, pred_class, conf_score, thumbnails[worst],
+                    inline_thumbnails, face_results
+                )
+            }
+        
+        if not frame_probabilities:
+            yield {"type": "error", "error": "Could not extract frames from video"}
+            return
+        
+        yield {
+            "type": "result",
+            **self.aggregate_verdict(torch.stack(frame_probabilities), frame_timestamps),
+            "total_frames": len(frame_probabilities),
+            # The stream classifies every sampled frame
+            "frames_sampled": len(frame_probabilities),
+            "frames_evaluated": len(frame_probabilities)
+        }
+    
+    def process_video(
+        self,
+        video_path: str,
+        model,
+        explainer=None,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        inline_thumbnails: bool = False,
+        multi_face: bool = False,
+        early_exit: bool = None,
+        input_sink: Optional[Callable[[int, torch.Tensor], None]] = None
+    ) -> Dict:
+        """Process entire video and return frame-by-frame analysis
+        
+        progress_callback(stage, done, total) is called as each stage
+        ("sampling", "face_detection", "inference", "encoding") advances.
+        With multi_face, every face above MULTI_FACE_MIN_SIZE is classified;
+        the crops of all frames share one batched pass and each frame
+        reports its faces with bounding boxes plus the worst-case face.
+        With early_exit, frames are evaluated coarse to fine in small batches
+        and evaluation stops as soon as a sequential test settles the verdict.
+        input_sink(frame number, input tensor) receives the model input behind
+        each evaluated frame's verdict, for explaining it later.
+        """
+        def report(stage: str, done: int, total: int):
+            if progress_callback is not None:
+                progress_callback(stage, done, total)
+        
         try:
             # Extract frames
-            frames, timestamps = self.sample_frames(video_path, config.MAX_FRAMES)
+            report("sampling", 0, 1)
+            with stage_timer("frame_sampling"):
+                frames, timestamps = self.sample_frames(video_path, config.MAX_FRAMES)
+            report("sampling", 1, 1)
             
             if not frames:
                 return {
@@ -170,87 +498,94 @@ class VideoProcessor:
                     "error": "Could not extract frames from video"
                 }
             
-            frame_results = []
-            predictions = []
-            confidences = []
+            if early_exit is None:
+                early_exit = config.EARLY_EXIT_ENABLED
+            test = SequentialTest() if early_exit else None
+            if early_exit:
+                order = progressive_order(len(frames))
+                batch_size = config.EARLY_EXIT_BATCH_SIZE
+            else:
+                order = list(range(len(frames)))
+                batch_size = len(frames)
+            # The tracker needs frames in playback order and follows one face
+            tracker = None if multi_face or early_exit else self.create_tracker()
             
-            for idx, (frame, timestamp) in enumerate(zip(frames, timestamps)):
-                # Process frame
-                face_crop = self.extract_face(frame)
+            evaluated = {}  # frame index -> (prediction, confidence, class probabilities, thumbnail, faces)
+            for batch_start in range(0, len(order), batch_size):
+                batch = order[batch_start:batch_start + batch_size]
                 
-                # Prepare for model
-                pil_image = Image.fromarray(face_crop)
-                tensor = self.transform(pil_image).unsqueeze(0)
+                # Crop faces from every frame and stack them so the model runs on
+                # one batch; frame_faces holds (frame index, first crop, faces)
+                frame_faces = []
+                crops = []
+                for idx in batch:
+                    faces = self.extract_faces(frames[idx]) if multi_face else [{"crop": self.extract_face(frames[idx], tracker)}]
+                    frame_faces.append((idx, len(crops), faces))
+                    crops.extend(face["crop"] for face in faces)
+                    report("face_detection", len(evaluated) + len(frame_faces), len(frames))
                 
-                # Move to CPU (Hugging Face Spaces uses CPU)
-                tensor = tensor.cpu()
+                thumbnails, probabilities, inputs = self.classify_crops(
+                    crops, model, explainer,
+                    on_chunk=None if early_exit else lambda done, total: report("inference", done, total)
+                )
                 
-                # Predict
-                with torch.no_grad():
-                    outputs = model(tensor)
-                    probabilities = torch.nn.functional.softmax(outputs, dim=1)
-                    confidence, predicted = torch.max(probabilities, 1)
+                for idx, start, faces in frame_faces:
+                    face_probabilities = probabilities[start:start + len(faces)]
                     
-                    pred_class = predicted.item()
-                    conf_score = confidence.item() * 100
+                    face_results = None
+                    worst = 0
+                    if multi_face:
+                        worst, face_results = self.summarize_faces(faces, face_probabilities)
                     
-                    predictions.append(pred_class)
-                    confidences.append(conf_score)
-                
-                # Generate thumbnail with optional heatmap
-                thumbnail = face_crop
-                if explainer:
-                    try:
-                        thumbnail = explainer.generate_heatmap_from_tensor(tensor, face_crop)
-                    except Exception as e:
-                        print(f"⚠️ Error generating heatmap for frame {idx}: {e}")
-                
-                # Convert timestamp to readable format
-                minutes = int(timestamp // 60)
-                seconds = int(timestamp % 60)
-                time_str = f"{minutes}:{seconds:02d}"
+                    confidence, predicted = torch.max(face_probabilities[worst], 0)
+                    evaluated[idx] = (
+                        predicted.item(), confidence.item() * 100, face_probabilities[worst],
+                        thumbnails[start + worst], face_results
+                    )
+                    if input_sink is not None:
+                        input_sink(idx + 1, inputs[start + worst])
+                    if test is not None:
+                        test.update(face_probabilities[worst][0].item())
                 
-                # Determine verdict
-                verdict = "FAKE" if pred_class == 0 else "REAL"
-                if 45 <= conf_score <= 65:
-                    verdict = "UNCERTAIN"
-                
-                frame_results.append({
-                    "frameNumber": idx + 1,
-                    "timestamp": time_str,
-                    "verdict": verdict,
-                    "confidence": round(conf_score, 2),
-                    "thumbnail": self.image_to_base64(thumbnail)
-                })
+                if early_exit:
+                    report("inference", len(evaluated), len(frames))
+                if test is not None and test.decision is not None:
+                    break
             
-            # Calculate overall verdict
-            fake_count = sum(1 for p in predictions if p == 0)
-            real_count = sum(1 for p in predictions if p == 1)
-            avg_confidence = sum(confidences) / len(confidences)
+            frame_results = []
+            frame_probabilities = []
+            for done, idx in enumerate(sorted(evaluated)):
+                pred_class, conf_score, frame_probability, thumbnail, face_results = evaluated[idx]
+                frame_probabilities.append(frame_probability)
+                
+                frame_results.append(self.build_frame_result(
+                    idx, timestamps[idx], pred_class, conf_score, thumbnail,
+                    inline_thumbnails, face_results
+                ))
+                report("encoding", done + 1, len(evaluated))
             
-            if fake_count > real_count:
-                final_verdict = "FAKE"
-                explanation = f"Analysis of {len(frames)} frames detected manipulation in {fake_count} frames. Inconsistencies in facial features and temporal artifacts suggest synthetic content."
-            elif real_count > fake_count:
-                final_verdict = "REAL"
-                explanation = f"Analysis of {len(frames)} frames shows consistent authentic features in {real_count} frames. No significant manipulation artifacts detected."
-            else:
-                final_verdict = "UNCERTAIN"
-                explanation = f"Analysis inconclusive. Equal distribution of authentic and synthetic indicators across {len(frames)} frames."
+            probabilities = torch.stack(frame_probabilities)
+            verdict = self.aggregate_verdict(probabilities, [timestamps[idx] for idx in sorted(evaluated)])
+            if test is not None and test.decision is not None:
+                verdict.update(self.sequential_verdict(test, probabilities[:, 0].tolist(), len(frames)))
             
-            return {
+            result = {
                 "success": True,
-                "verdict": final_verdict,
-                "confidence": round(avg_confidence, 2),
-                "explanation": explanation,
+                **verdict,
                 "frames": frame_results,
-                "total_frames": len(frames)
+                "total_frames": len(frame_results),
+                "frames_sampled": len(frames),
+                "frames_evaluated": len(evaluated)
             }
+            if test is not None:
+                result["sequential_test"] = test.summary()
+            return result
             
         except Exception as e:
             import traceback
             traceback.print_exc()
+            ERRORS.inc(stage="video_processing")
             return {
                 "success": False,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
@@ -1,3 +1,4 @@
+import { useState } from 'react';
 import { Film, CheckCircle2, XCircle, AlertCircle } from 'lucide-react';
 import { Verdict } from './ResultCard';
 
@@ -7,6 +8,7 @@ interface FramePrediction {
   verdict: Verdict;
   confidence: number;
   thumbnail: string;
+  explanation_url?: string;
 }
 
 interface FrameAnalysisProps {
@@ -27,6 +29,21 @@ const verdictColors = {
 };
 
 export const FrameAnalysis = ({ frames, finalVerdict }: FrameAnalysisProps) => {
+  // Heatmaps are rendered on demand by the API, so only request one once its frame is clicked
+  const [heatmapFrames, setHeatmapFrames] = useState<Set<number>>(new Set());
+
+  const toggleHeatmap = (frameNumber: number) => {
+    setHeatmapFrames((current) => {
+      const next = new Set(current);
+      if (next.has(frameNumber)) {
+        next.delete(frameNumber);
+      } else {
+        next.add(frameNumber);
+      }
+      return next;
+    });
+  };
+
   const verdictCounts = frames.reduce((acc, frame) => {
     acc[frame.verdict] = (acc[frame.verdict] || 0) + 1;
     return acc;
@@ -65,15 +82,17 @@ export const FrameAnalysis = ({ frames, finalVerdict }: FrameAnalysisProps) => {
         <div className="grid grid-cols-4 md:grid-cols-6 gap-3">
           {frames.map((frame) => {
             const Icon = verdictIcons[frame.verdict];
+            const showHeatmap = frame.explanation_url && heatmapFrames.has(frame.frameNumber);
             return (
               <div 
                 key={frame.frameNumber}
                 className="relative group cursor-pointer"
+                onClick={() => frame.explanation_url && toggleHeatmap(frame.frameNumber)}
               >
                 <div className="rounded-lg overflow-hidden border border-border">
                   <img 
-                    src={frame.thumbnail} 
-                    alt={`Frame ${frame.frameNumber}`}
+                    src={showHeatmap ? frame.explanation_url : frame.thumbnail} 
+                    alt={showHeatmap ? `Frame ${frame.frameNumber} heatmap` : `Frame ${frame.frameNumber}`}
                     className="w-full h-16 object-cover"
                   />
                 </div>
@@ -90,6 +109,11 @@ export const FrameAnalysis = ({ frames, finalVerdict }: FrameAnalysisProps) => {
                 <div className="absolute inset-0 bg-card/90 backdrop-blur-sm opacity-0 group-hover:opacity-100 transition-opacity rounded-lg flex flex-col items-center justify-center text-xs">
                   <span className="font-medium">{frame.timestamp}</span>
                   <span className="text-muted-foreground">{frame.confidence}%</span>
+                  {frame.explanation_url && (
+                    <span className="text-muted-foreground">
+                      {showHeatmap ? 'Hide heatmap' : 'Show heatmap'}
+                    </span>
+                  )}
                 </div>
               </div>
             );
@@ -3,7 +3,9 @@ import cv2
 import numpy as np
 import mediapipe as mp
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+from .frame_sampler import sample_indices, read_frames, AUTO
 
 
 class FaceExtractor:
@@ -32,23 +34,11 @@ class FaceExtractor:
             Cropped and resized face (224x224) or None if no face detected
         """
         # Exact implementation from notebook
-        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = self.face_detector.process(rgb)
-        
-        if not results.detections:
+        boxes = self.detect_boxes(image)
+        if not boxes:
             return None
         
-        h, w, _ = image.shape
-        bbox = results.detections[0].location_data.relative_bounding_box
-        
-        x1 = int(bbox.xmin * w)
-        y1 = int(bbox.ymin * h)
-        x2 = int((bbox.xmin + bbox.width) * w)
-        y2 = int((bbox.ymin + bbox.height) * h)
-        
-        x1, y1 = max(0, x1), max(0, y1)
-        x2, y2 = min(w, x2), min(h, y2)
-        
+        x1, y1, x2, y2 = boxes[0]
         face = image[y1:y2, x1:x2]
         if face.size == 0:
             return None
@@ -56,12 +46,74 @@ class FaceExtractor:
         # Resize to 224x224 as in notebook
         return cv2.resize(face, (224, 224))
     
-    def sample_frames(self, video_path: str, num_frames: int = 5) -> List[np.ndarray]:
-        """Sample frames uniformly from video - exact logic from notebook.
+    def detect_boxes(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Detect every face in an image with a single MediaPipe pass.
+        
+        Args:
+            image: Input image as numpy array (BGR format)
+            
+        Returns:
+            Pixel boxes (x1, y1, x2, y2) clipped to the image, in detection order
+        """
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        results = self.face_detector.process(rgb)
+        
+        if not results.detections:
+            return []
+        
+        h, w, _ = image.shape
+        boxes = []
+        for detection in results.detections:
+            bbox = detection.location_data.relative_bounding_box
+            
+            x1 = int(bbox.xmin * w)
+            y1 = int(bbox.ymin * h)
+            x2 = int((bbox.xmin + bbox.width) * w)
+            y2 = int((bbox.ymin + bbox.height) * h)
+            
+            boxes.append((max(0, x1), max(0, y1), min(w, x2), min(h, y2)))
+        return boxes
+    
+    def extract_faces(
+        self,
+        image: np.ndarray,
+        min_size: int = 40,
+        max_faces: Optional[int] = None
+    ) -> List[Dict]:
+        """Extract every face at least min_size pixels on its shorter side.
+        
+        Args:
+            image: Input image as numpy array (BGR format)
+            min_size: Smallest face side in pixels to keep
+            max_faces: Keep at most this many faces, largest first
+            
+        Returns:
+            List of {"face": 224x224 crop, "bbox": (x1, y1, x2, y2)}, largest first
+        """
+        faces = []
+        for x1, y1, x2, y2 in self.detect_boxes(image):
+            if min(x2 - x1, y2 - y1) < max(min_size, 1):
+                continue
+            faces.append({
+                "face": cv2.resize(image[y1:y2, x1:x2], (224, 224)),
+                "bbox": (x1, y1, x2, y2)
+            })
+        
+        faces.sort(key=lambda f: (f["bbox"][2] - f["bbox"][0]) * (f["bbox"][3] - f["bbox"][1]), reverse=True)
+        return faces[:max_faces] if max_faces is not None else faces
+    
+    def sample_frames(
+        self,
+        video_path: str,
+        num_frames: int = 5,
+        strategy: str = AUTO
+    ) -> List[np.ndarray]:
+        """Sample frames uniformly from video - same indices as the notebook.
         
         Args:
             video_path: Path to input video file
             num_frames: Number of frames to sample
+            strategy: Decode strategy from frame_sampler (sequential, seek or auto)
             
         Returns:
             List of sampled frames
@@ -69,14 +121,8 @@ class FaceExtractor:
         cap = cv2.VideoCapture(video_path)
         total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
-        frame_ids = np.linspace(0, total - 1, num_frames, dtype=int) if total > num_frames else range(total)
-        frames = []
-        
-        for fid in frame_ids:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, fid)
-            ret, frame = cap.read()
-            if ret:
-                frames.append(frame)
+        frame_ids = sample_indices(total, num_frames)
+        frames = [frame for _, frame in read_frames(cap, frame_ids, strategy=strategy)]
         
         cap.release()
         return frames
@@ -84,27 +130,47 @@ class FaceExtractor:
     def extract_faces_from_video(
         self, 
         video_path: str,
-        num_frames: int = 5
+        num_frames: int = 5,
+        multi_face: bool = False,
+        min_size: int = 40
     ) -> List[np.ndarray]:
         """Extract faces from video - exact logic from notebook.
         
         Args:
             video_path: Path to input video file
             num_frames: Number of frames to sample
+            multi_face: Keep every face above min_size instead of only the first
+            min_size: Smallest face side in pixels to keep in multi-face mode
             
         Returns:
-            List of extracted face images (224x224)
+            List of extracted face images (224x224), ready to be stacked into
+            one batch
         """
         frames = self.sample_frames(video_path, num_frames)
         faces = []
         
         for frame in frames:
+            if multi_face:
+                faces.extend(f["face"] for f in self.extract_faces(frame, min_size))
+                continue
             face = self.extract_face(frame)
             if face is not None:
                 faces.append(face)
         
         return faces
     
+    def close(self):
+        """Release the MediaPipe graph; safe to call more than once."""
+        if getattr(self, "face_detector", None) is not None:
+            self.face_detector.close()
+            self.face_detector = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
     def __del__(self):
         """Cleanup MediaPipe resources."""
-        self.face_detector.close()
+        self.close()
@@ -0,0 +1,89 @@
+"""Frame sampling strategies that avoid a keyframe seek for every sample."""
+import cv2
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+
+SEQUENTIAL = "sequential"
+SEEK = "seek"
+AUTO = "auto"
+
+# Roughly one GOP: below this gap decoding forward beats a keyframe seek
+DEFAULT_MAX_GAP = 60
+
+
+def sample_indices(total_frames: int, num_frames: int) -> List[int]:
+    """Evenly spaced frame indices, as in the notebook.
+
+    Args:
+        total_frames: Number of frames in the video
+        num_frames: Number of frames to sample
+
+    Returns:
+        Sorted list of frame indices
+    """
+    if total_frames > num_frames:
+        return np.linspace(0, total_frames - 1, num_frames, dtype=int).tolist()
+    return list(range(total_frames))
+
+
+def choose_strategy(total_frames: int, num_frames: int, max_gap: int = DEFAULT_MAX_GAP) -> str:
+    """Pick sequential decoding when samples are closer together than about a GOP.
+
+    Args:
+        total_frames: Number of frames in the video
+        num_frames: Number of frames to sample
+        max_gap: Largest average gap between samples for sequential decoding
+
+    Returns:
+        SEQUENTIAL or SEEK
+    """
+    if num_frames <= 0 or total_frames <= num_frames:
+        return SEQUENTIAL
+    return SEQUENTIAL if total_frames / num_frames <= max_gap else SEEK
+
+
+def read_frames(
+    cap: cv2.VideoCapture,
+    indices: List[int],
+    strategy: str = AUTO,
+    max_gap: int = DEFAULT_MAX_GAP
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield (frame index, BGR frame) for the requested indices in ascending order.
+
+    SEQUENTIAL decodes straight through, using grab() to skip frames without
+    the colour conversion done by retrieve(). SEEK only seeks for jumps longer
+    than max_gap and grabs forward otherwise. Unreadable indices are skipped.
+
+    Args:
+        cap: Freshly opened video capture
+        indices: Frame indices to read
+        strategy: SEQUENTIAL, SEEK or AUTO
+        max_gap: Gap (in frames) above which a seek is used
+
+    Returns:
+        Iterator of (index, frame) pairs
+    """
+    targets = sorted(set(indices))
+    if strategy == AUTO:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        strategy = choose_strategy(total_frames, len(targets), max_gap)
+    if strategy not in (SEQUENTIAL, SEEK):
+        raise ValueError(f"Unknown frame sampler strategy: {strategy}")
+
+    position: Optional[int] = 0
+    for target in targets:
+        if strategy == SEEK and (position is None or target < position or target - position > max_gap):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            position = target
+        while position < target:
+            if not cap.grab():
+                break
+            position += 1
+        ret, frame = cap.read()
+        if not ret:
+            if strategy == SEQUENTIAL:
+                return
+            position = None
+            continue
+        position = target + 1
+        yield target, frame
@@ -3,13 +3,26 @@ import torch
 import numpy as np
 import cv2
 from PIL import Image
-from typing import Optional
+from typing import List, Optional, Sequence, Union
 
 from pytorch_grad_cam import GradCAM as PytorchGradCAM
 from pytorch_grad_cam.utils.model_targets import ClassifierOutputTarget
 from pytorch_grad_cam.utils.image import show_cam_on_image
 
 
+class PredictedClassTarget:
+    """Target the highest-scoring class of each output row.
+    
+    Lets per-item targets mix explicit classes with "whatever the model
+    predicted" while reading the prediction from the CAM's own forward pass.
+    """
+    
+    def __call__(self, model_output: torch.Tensor) -> torch.Tensor:
+        if model_output.dim() == 1:
+            return model_output[model_output.argmax()]
+        return model_output.gather(-1, model_output.argmax(dim=-1, keepdim=True)).squeeze(-1)
+
+
 class GradCAM:
     """Generate Grad-CAM visualizations - exact implementation from notebook."""
     
@@ -33,6 +46,39 @@ class GradCAM:
             target_layers=target_layers
         )
     
+    def generate_cams(
+        self,
+        input_tensor: torch.Tensor,
+        target_classes: Optional[Sequence[Optional[int]]] = None
+    ) -> tuple:
+        """Generate Grad-CAM heatmaps for a batch in one forward/backward pass.
+        
+        Args:
+            input_tensor: Input image tensor [N, 3, H, W]
+            target_classes: Per-item target class indices; None (for the whole
+                batch or an item) uses the predicted class
+            
+        Returns:
+            Tuple of (cams [N, H, W], predicted_classes [N]), with the
+            predictions taken from the same forward pass as the CAMs
+        """
+        if target_classes is None:
+            targets = None
+        else:
+            if len(target_classes) != input_tensor.shape[0]:
+                raise ValueError(
+                    f"Got {len(target_classes)} target classes for a batch of {input_tensor.shape[0]}"
+                )
+            targets = [
+                PredictedClassTarget() if target_class is None else ClassifierOutputTarget(target_class)
+                for target_class in target_classes
+            ]
+        
+        cams = self.cam(input_tensor=input_tensor, targets=targets)
+        predicted_classes = self.cam.outputs.argmax(dim=1).cpu().numpy()
+        
+        return cams, predicted_classes
+    
     def generate_cam(
         self, 
         input_tensor: torch.Tensor, 
@@ -47,22 +93,54 @@ class GradCAM:
         Returns:
             Grad-CAM heatmap as numpy array
         """
-        # Get prediction if target_class not specified
-        if target_class is None:
-            with torch.no_grad():
-                outputs = self.model(input_tensor)
-                target_class = outputs.argmax(dim=1).item()
-        
-        # Create target
-        targets = [ClassifierOutputTarget(target_class)]
-        
-        # Generate Grad-CAM (returns grayscale_cam for first image)
-        grayscale_cam = self.cam(
-            input_tensor=input_tensor,
-            targets=targets
-        )[0]
-        
-        return grayscale_cam
+        cams, _ = self.generate_cams(input_tensor, [target_class])
+        return cams[0]
+    
+    @staticmethod
+    def overlay_cams(
+        images: Union[np.ndarray, List[Image.Image]],
+        cams: np.ndarray,
+        use_rgb: bool = True,
+        image_weight: float = 0.5
+    ) -> np.ndarray:
+        """Overlay Grad-CAMs on a batch of images at once.
+        
+        Vectorized equivalent of calling show_cam_on_image per image: the
+        colormap is applied to all CAMs as one tall image and the blend and
+        per-image normalization are batched array ops.
+        
+        Args:
+            images: Original images as a list of PIL Images or an [N, H, W, 3]
+                array (uint8, or float in [0, 1]); resized to the CAM size if needed
+            cams: Grad-CAM heatmaps [N, H, W] in [0, 1]
+            use_rgb: Whether to use RGB format
+            image_weight: Weight of the image in the blend
+            
+        Returns:
+            Overlay visualizations as a uint8 array [N, H, W, 3]
+        """
+        count, height, width = cams.shape
+        images = [np.asarray(image) for image in images]
+        images = np.stack([
+            image if image.shape[:2] == (height, width) else cv2.resize(image, (width, height))
+            for image in images
+        ])
+        if images.dtype == np.uint8:
+            images = images.astype(np.float32) / 255.0
+        if images.max() > 1:
+            raise ValueError("The input images should be float32 in the range [0, 1]")
+        
+        heatmaps = cv2.applyColorMap(
+            np.uint8(255 * cams).reshape(count * height, width),
+            cv2.COLORMAP_JET
+        ).reshape(count, height, width, 3)
+        if use_rgb:
+            heatmaps = heatmaps[..., ::-1]
+        heatmaps = heatmaps.astype(np.float32) / 255.0
+        
+        visualizations = (1 - image_weight) * heatmaps + image_weight * images
+        visualizations /= visualizations.max(axis=(1, 2, 3), keepdims=True)
+        return np.uint8(255 * visualizations)
     
     def overlay_cam(
         self, 
@@ -92,6 +170,26 @@ class GradCAM:
         
         return visualization
     
+    def generate_and_overlay_batch(
+        self,
+        images: Union[np.ndarray, List[Image.Image]],
+        input_tensor: torch.Tensor,
+        target_classes: Optional[Sequence[Optional[int]]] = None
+    ) -> tuple:
+        """Generate Grad-CAMs and overlays for a whole batch.
+        
+        Args:
+            images: Original images (see overlay_cams)
+            input_tensor: Preprocessed input tensor [N, 3, H, W]
+            target_classes: Per-item target class indices (None uses the prediction)
+            
+        Returns:
+            Tuple of (cams [N, H, W], visualizations [N, H, W, 3], predicted_classes [N])
+        """
+        cams, predicted_classes = self.generate_cams(input_tensor, target_classes)
+        visualizations = self.overlay_cams(images, cams)
+        return cams, visualizations, predicted_classes
+    
     def generate_and_overlay(
         self,
         image: Image.Image,
@@ -108,15 +206,7 @@ class GradCAM:
         Returns:
             Tuple of (grayscale_cam, visualization, predicted_class)
         """
-        # Get prediction
-        with torch.no_grad():
-            outputs = self.model(input_tensor)
-            pred_class = outputs.argmax(dim=1).item()
-        
-        # Generate CAM
-        cam = self.generate_cam(input_tensor, target_class or pred_class)
-        
-        # Create overlay
-        visualization = self.overlay_cam(image, cam)
+        cams, predicted_classes = self.generate_cams(input_tensor, [target_class])
+        visualization = self.overlay_cam(image, cams[0])
         
-        return cam, visualization, pred_class
+        return cams[0], visualization, int(predicted_classes[0])
@@ -0,0 +1,94 @@
+"""Export a trained checkpoint to TorchScript or ONNX for CPU inference.
+
+Usage (from the repository root):
+    python -m src.models.export --checkpoint backend/models/best_efficientnet_b0.pth \
+        --format onnx --output backend/models/efficientnet_b0.onnx
+"""
+import argparse
+from pathlib import Path
+
+import torch
+
+from .efficientnet import load_model_from_checkpoint
+
+INPUT_SIZE = (224, 224)
+
+
+def export_torchscript(
+    checkpoint_path: str,
+    output_path: str,
+    num_classes: int = 2
+) -> Path:
+    """Trace the checkpoint into a TorchScript module.
+
+    Args:
+        checkpoint_path: Path to .pth checkpoint file
+        output_path: Where to write the TorchScript module
+        num_classes: Number of output classes
+
+    Returns:
+        Path to the exported module
+    """
+    model = load_model_from_checkpoint(checkpoint_path, num_classes=num_classes, device='cpu')
+    example = torch.zeros((1, 3, *INPUT_SIZE))
+
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    traced.save(str(output_path))
+    return output_path
+
+
+def export_onnx(
+    checkpoint_path: str,
+    output_path: str,
+    num_classes: int = 2,
+    opset_version: int = 17
+) -> Path:
+    """Export the checkpoint to ONNX with a dynamic batch dimension.
+
+    Args:
+        checkpoint_path: Path to .pth checkpoint file
+        output_path: Where to write the .onnx graph
+        num_classes: Number of output classes
+        opset_version: ONNX opset to target
+
+    Returns:
+        Path to the exported graph
+    """
+    model = load_model_from_checkpoint(checkpoint_path, num_classes=num_classes, device='cpu')
+    example = torch.zeros((1, 3, *INPUT_SIZE))
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    torch.onnx.export(
+        model,
+        example,
+        str(output_path),
+        input_names=["input"],
+        output_names=["logits"],
+        dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=opset_version
+    )
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checkpoint", required=True, help="Path to the .pth checkpoint")
+    parser.add_argument("--format", choices=["torchscript", "onnx"], required=True)
+    parser.add_argument("--output", required=True, help="Output file path")
+    parser.add_argument("--num-classes", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.format == "torchscript":
+        path = export_torchscript(args.checkpoint, args.output, args.num_classes)
+    else:
+        path = export_onnx(args.checkpoint, args.output, args.num_classes)
+    print(f"Exported {args.format} model to {path}")
+
+
+if __name__ == "__main__":
+    main()
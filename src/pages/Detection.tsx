@@ -22,6 +22,7 @@ interface AnalysisResult {
     verdict: Verdict;
     confidence: number;
     thumbnail: string;
+    explanation_url?: string;
   }>;
   file_id?: string;
 }
@@ -25,6 +25,11 @@ class ApiService {
 
       const result = await response.json();
       
+      // The heatmap is rendered on demand, the first time its explanation URL is requested
+      if (!result.heatmap_url && result.explanation_url) {
+        result.heatmap_url = result.explanation_url;
+      }
+
       // Convert heatmap URL to full URL if it exists
       if (result.heatmap_url) {
         result.heatmap_url = `${API_BASE_URL}${result.heatmap_url}`;
@@ -58,6 +63,20 @@ class ApiService {
       }
 
       const result = await response.json();
+
+      // Responses cached before the sampler counts were reported only carry total_frames
+      result.frames_sampled = result.frames_sampled ?? result.total_frames;
+      result.frames_evaluated = result.frames_evaluated ?? result.total_frames;
+
+      // Thumbnails and on-demand heatmaps are served by the API; convert relative URLs to full URLs
+      if (result.frames) {
+        result.frames = result.frames.map((frame: any) => ({
+          ...frame,
+          thumbnail: frame.thumbnail?.startsWith('/') ? `${API_BASE_URL}${frame.thumbnail}` : frame.thumbnail,
+          explanation_url: frame.explanation_url ? `${API_BASE_URL}${frame.explanation_url}` : undefined,
+        }));
+      }
+
       return result;
     } catch (error) {
       console.error('Error analyzing video:', error);